@@ -0,0 +1,33 @@
+"""
+Performance scripts for the task manager.
+
+They are not collected by pytest; run them as modules, for example
+``uv run python -m benchmarks.task_filter_plans --tasks 100000``.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+
+def setup_django(database_url=None):
+    """Configure Django for a standalone benchmark run.
+
+    Without an explicit ``database_url`` a throwaway SQLite file is used so
+    the development database is never touched.
+    """
+    if database_url is None:
+        directory = tempfile.mkdtemp(prefix='task-manager-bench-')
+        database_url = f"sqlite:///{Path(directory) / 'bench.sqlite3'}"
+
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    # DEBUG keeps every executed query in memory, which skews long runs.
+    os.environ['DEBUG'] = ''
+    # pages are rendered without running collectstatic first
+    os.environ.setdefault('STATIC_MANIFEST', 'false')
+
+    import django
+
+    django.setup()
+    return database_url
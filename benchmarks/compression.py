@@ -0,0 +1,130 @@
+"""
+CPU time against bytes saved for every encoding and level of
+``CompressionMiddleware``, measured on our own pages.
+
+    uv run python -m benchmarks.compression --tasks 10000
+
+The pages are rendered once, uncompressed, through the test client: the
+task list (with the filter form), the task form, the user list and the JSON
+API, plus the streamed CSV export, which is reported on its own. Each one
+is then compressed ``--repeat`` times per level. For every encoding the
+report suggests the level that saves the most bytes on the pages while
+compressing the largest of them within ``--budget-ms`` and the export at
+``--min-mibs`` or faster; that is how the defaults of ``COMPRESSION_LEVELS``
+were chosen.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks import setup_django
+
+PAGES = {
+    'tasks index': '/tasks/',
+    'task form': '/tasks/create/',
+    'users index': '/users/',
+    'api tasks': '/api/tasks/?limit=100',
+}
+EXPORT = '/tasks/export/?format=csv'
+
+LEVELS = {
+    'gzip': range(1, 10),
+    'br': range(0, 12),
+    'zstd': (1, 2, 3, 4, 6, 9, 12, 15, 19),
+}
+
+
+def render(client, url):
+    response = client.get(url, HTTP_ACCEPT_ENCODING='identity')
+    assert response.status_code == 200, (url, response.status_code)
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+def measure(encoder_class, level, content, repeat):
+    from task_manager.response_compression import compress
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(compress(content, encoder_class(level)))
+        timings.append((time.perf_counter() - started) * 1000)
+    return size, statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=0.5,
+                        help='compression time allowed for the largest page')
+    parser.add_argument('--min-mibs', type=float, default=40.0,
+                        help='slowest acceptable export compression, MiB/s')
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args(argv)
+
+    setup_django(args.database_url)
+
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.test import Client
+
+    from benchmarks.seed import seed
+    from task_manager.response_compression import ENCODERS
+
+    call_command('migrate', verbosity=0)
+    seed(users=args.users, tasks=args.tasks, stdout=sys.stderr)
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(get_user_model().objects.first())
+    pages = {name: render(client, url) for name, url in PAGES.items()}
+    export = render(client, EXPORT)
+    largest = max(pages, key=lambda name: len(pages[name]))
+
+    sys.stdout.write(''.join(
+        f'{name:<14}{len(content) / 1024:>9.1f} KiB\n'
+        for name, content in {**pages, 'csv export': export}.items()
+    ))
+    sys.stdout.write(
+        f"\n{'':<16}{'pages':>30}{'csv export':>18}\n"
+        f"{'encoding':<10}{'level':>6}{'ratio':>8}{'saved KiB':>11}"
+        f"{'largest ms':>11}{'ratio':>8}{'MiB/s':>10}\n"
+    )
+    original = sum(len(content) for content in pages.values())
+    for encoding, encoder_class in ENCODERS.items():
+        best = None
+        for level in LEVELS[encoding]:
+            sizes = {}
+            timings = {}
+            for name, content in pages.items():
+                sizes[name], timings[name] = measure(
+                    encoder_class, level, content, args.repeat
+                )
+            export_size, export_ms = measure(
+                encoder_class, level, export, max(1, args.repeat // 10)
+            )
+            saved = original - sum(sizes.values())
+            throughput = len(export) / 1024 / 1024 / export_ms * 1000
+            sys.stdout.write(
+                f'{encoding:<10}{level:>6}'
+                f'{original / sum(sizes.values()):>8.2f}'
+                f'{saved / 1024:>11.1f}{timings[largest]:>11.3f}'
+                f'{len(export) / export_size:>8.2f}'
+                f'{throughput:>10.1f}\n'
+            )
+            if (
+                timings[largest] <= args.budget_ms
+                and throughput >= args.min_mibs
+                and (best is None or saved > best[1])
+            ):
+                best = (level, saved)
+        if best is not None:
+            sys.stdout.write(f'{encoding}: suggested level {best[0]}\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,457 @@
+"""
+Latency, throughput and SQL queries of the pages and CRUD endpoints.
+
+    uv run python -m benchmarks.endpoints --tasks 10000 --requests 200
+    uv run python -m benchmarks.endpoints --transport gunicorn --workers 4 \\
+        --concurrency 8 --save baseline.json
+    uv run python -m benchmarks.endpoints --baseline baseline.json
+
+The dataset is seeded by ``benchmarks.seed`` from ``--seed``, so runs with
+the same arguments request the same pages. Each scenario is driven through
+the Django test client (in process), a local gunicorn, or both. Query
+counts are read from the ``Server-Timing`` header of the timing middleware.
+Objects the write scenarios need (the task to delete, for example) are
+created before each timed request.
+
+``--save`` writes the results as JSON. ``--baseline`` compares the run with
+such a file and exits with status 1 when a p95 grows by more than
+``--tolerance`` or an endpoint runs more queries than before.
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.cookiejar import CookieJar
+from statistics import median_low
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import (
+    HTTPCookieProcessor,
+    HTTPRedirectHandler,
+    Request,
+    build_opener,
+)
+
+from benchmarks import setup_django
+
+PASSWORD = 'benchmark'
+FILTERS = ('status', 'executor', 'labels', 'self_tasks')
+QUERIES = re.compile(r'desc="(\d+) queries"')
+WIDTH = 64
+
+
+@dataclass
+class Call:
+    method: str
+    path: str
+    data: dict = None
+    # None means the benchmark's main user
+    user: object = None
+
+
+class Dataset:
+    def __init__(self, user_ids, status_ids, label_ids, random_seed):
+        import random
+
+        from django.contrib.auth import get_user_model
+
+        from task_manager.tasks.models import Task
+
+        self.User = get_user_model()
+        self.user = self.User.objects.get(pk=user_ids[0])
+        self.user_ids = user_ids
+        self.status_ids = status_ids
+        self.label_ids = label_ids
+        self.task_ids = list(Task.objects.values_list('pk', flat=True))
+        self.rng = random.Random(random_seed)
+        self.numbers = itertools.count()
+        self.lock = threading.Lock()
+
+    def pick(self, name):
+        with self.lock:
+            return self.rng.choice(getattr(self, name))
+
+    def number(self):
+        with self.lock:
+            return next(self.numbers)
+
+    def task_form(self):
+        return {
+            'name': f'Benchmark task {self.number()}',
+            'description': 'Created by the benchmark',
+            'status': self.pick('status_ids'),
+            'executor': self.pick('user_ids'),
+            'labels': [self.pick('label_ids'), self.pick('label_ids')],
+        }
+
+
+def tasks_index(filters):
+    def prepare(dataset):
+        params = {}
+        for name in filters:
+            if name == 'self_tasks':
+                params[name] = 'on'
+            else:
+                params[name] = dataset.pick(
+                    {'executor': 'user_ids', 'labels': 'label_ids'}.get(
+                        name, 'status_ids'
+                    )
+                )
+        query = f'?{urlencode(params)}' if params else ''
+        return Call('GET', f'/tasks/{query}')
+    return prepare
+
+
+def task_show(dataset):
+    return Call('GET', f"/tasks/{dataset.pick('task_ids')}/")
+
+
+def task_create(dataset):
+    return Call('POST', '/tasks/create/', dataset.task_form())
+
+
+def task_update(dataset):
+    return Call(
+        'POST', f"/tasks/{dataset.pick('task_ids')}/update/",
+        dataset.task_form(),
+    )
+
+
+def task_delete(dataset):
+    from task_manager.tasks.models import Task
+
+    task = Task.objects.create(
+        name=f'Benchmark task {dataset.number()}',
+        status_id=dataset.pick('status_ids'),
+        author=dataset.user,
+    )
+    return Call('POST', f'/tasks/{task.pk}/delete/')
+
+
+def users_index(dataset):
+    return Call('GET', '/users/')
+
+
+def status_delete(dataset):
+    from task_manager.statuses.models import Status
+
+    status = Status.objects.create(name=f'Benchmark {dataset.number()}')
+    return Call('POST', f'/statuses/{status.pk}/delete/')
+
+
+def label_delete(dataset):
+    from task_manager.labels.models import Label
+
+    label = Label.objects.create(name=f'Benchmark {dataset.number()}')
+    return Call('POST', f'/labels/{label.pk}/delete/')
+
+
+def user_delete(dataset):
+    user = dataset.User.objects.create_user(
+        username=f'benchmark_{dataset.number()}', password=PASSWORD
+    )
+    return Call('POST', f'/users/{user.pk}/delete/', user=user)
+
+
+SCENARIOS = {
+    **{
+        'tasks_index[{}]'.format('+'.join(filters) or 'all'):
+            tasks_index(filters)
+        for size in range(len(FILTERS) + 1)
+        for filters in itertools.combinations(FILTERS, size)
+    },
+    'task_show': task_show,
+    'task_create': task_create,
+    'task_update': task_update,
+    'task_delete': task_delete,
+    'users_index': users_index,
+    'status_delete': status_delete,
+    'label_delete': label_delete,
+    'user_delete': user_delete,
+}
+
+
+class ClientSession:
+    def __init__(self, user):
+        from django.test import Client
+
+        self.client = Client(HTTP_HOST='localhost')
+        self.client.force_login(user)
+
+    def request(self, call):
+        method = getattr(self.client, call.method.lower())
+        response = method(call.path, call.data)
+        return response.status_code, response.get('Server-Timing', '')
+
+
+class NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpSession:
+    def __init__(self, base_url, user):
+        self.base_url = base_url
+        self.cookies = CookieJar()
+        self.opener = build_opener(
+            HTTPCookieProcessor(self.cookies), NoRedirect
+        )
+        self.request(Call('GET', '/login/'))
+        status, _ = self.request(Call(
+            'POST', '/login/',
+            {'username': user.username, 'password': PASSWORD},
+        ))
+        if status != 302:
+            raise RuntimeError(f'Could not log in as {user.username}')
+
+    def request(self, call):
+        body = None
+        if call.method == 'POST':
+            token = next(
+                cookie.value for cookie in self.cookies
+                if cookie.name == 'csrftoken'
+            )
+            body = urlencode(
+                {**call.data, 'csrfmiddlewaretoken': token}
+                if call.data else {'csrfmiddlewaretoken': token},
+                doseq=True,
+            ).encode()
+        request = Request(
+            self.base_url + call.path, data=body, method=call.method
+        )
+        try:
+            response = self.opener.open(request)
+        except HTTPError as error:
+            response = error
+        with response:
+            response.read()
+            return response.status, response.headers.get('Server-Timing', '')
+
+
+@contextmanager
+def gunicorn(database_url, workers):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', 'task_manager.wsgi',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+            '--log-level', 'warning',
+        ],
+        env=dict(os.environ, DATABASE_URL=database_url),
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), 1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError('gunicorn did not start')
+                time.sleep(0.1)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@contextmanager
+def sessions(transport, database_url, args):
+    """Yield a factory of logged in sessions for ``transport``."""
+    if transport == 'client':
+        yield ClientSession
+        return
+    with gunicorn(database_url, args.workers) as base_url:
+        yield lambda user: HttpSession(base_url, user)
+
+
+def run_scenario(prepare, dataset, new_session, requests, concurrency, warmup):
+    from task_manager.metrics import Histogram
+
+    latencies = Histogram()
+    queries = []
+    errors = 0
+    busy = 0.0
+    lock = threading.Lock()
+
+    def worker(count, timed):
+        nonlocal errors, busy
+        session = new_session(dataset.user)
+        for _ in range(count):
+            try:
+                call = prepare(dataset)
+                current = new_session(call.user) if call.user else session
+                started = time.perf_counter()
+                status, timing = current.request(call)
+                elapsed = time.perf_counter() - started
+            except Exception as error:
+                # e.g. "database is locked" with SQLite and --concurrency
+                sys.stderr.write(f'{type(error).__name__}: {error}\n')
+                status, elapsed = None, None
+            if not timed:
+                continue
+            with lock:
+                if elapsed is None:
+                    errors += 1
+                    continue
+                if status != (302 if call.method == 'POST' else 200):
+                    errors += 1
+                latencies.record(elapsed * 1e6)
+                busy += elapsed
+                match = QUERIES.search(timing)
+                if match:
+                    queries.append(int(match.group(1)))
+
+    worker(warmup, timed=False)
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(requests // concurrency + (n < requests % concurrency),
+                  True),
+        )
+        for n in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'p50_ms': round(latencies.quantile(0.5) / 1000, 3),
+        'p95_ms': round(latencies.quantile(0.95) / 1000, 3),
+        'p99_ms': round(latencies.quantile(0.99) / 1000, 3),
+        # requests per second with `concurrency` requests always in flight
+        'rps': round(latencies.count * concurrency / busy, 1) if busy else 0,
+        'queries': median_low(queries) if queries else None,
+        'errors': errors,
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    sys.stdout.write(
+        f"\n{'vs baseline':<{WIDTH}}{'p95':>10}{'queries':>10}\n"
+    )
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        p95 = result['p95_ms'] / old['p95_ms'] - 1 if old['p95_ms'] else 0
+        queries = (result['queries'] or 0) - (old['queries'] or 0)
+        sys.stdout.write(f'{key:<{WIDTH}}{p95:>+10.0%}{queries:>+10}\n')
+        if p95 > tolerance or queries > 0:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--statuses', type=int, default=10)
+    parser.add_argument('--labels', type=int, default=50)
+    parser.add_argument('--tasks', type=int, default=10_000)
+    parser.add_argument('--labels-per-task', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--scenario', action='append',
+                        help='run only these scenarios (repeatable)')
+    parser.add_argument('--transport', default='client',
+                        choices=('client', 'gunicorn', 'both'))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='parallel clients for the gunicorn transport')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed p95 growth over the baseline')
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args(argv)
+
+    transports = (
+        ('client', 'gunicorn') if args.transport == 'both'
+        else (args.transport,)
+    )
+    if 'gunicorn' in transports:
+        # the benchmark process writes too, so share the cache and with it
+        # the version stamps that invalidate cached pages
+        os.environ['CACHE_BACKEND'] = 'file'
+        os.environ['CACHE_LOCATION'] = tempfile.mkdtemp(
+            prefix='task-manager-bench-cache-'
+        )
+    database_url = setup_django(args.database_url)
+
+    from django.core.management import call_command
+
+    from benchmarks.seed import seed
+
+    call_command('migrate', verbosity=0)
+    dataset = Dataset(
+        *seed(
+            users=args.users, statuses=args.statuses, labels=args.labels,
+            tasks=args.tasks, labels_per_task=args.labels_per_task,
+            random_seed=args.seed, stdout=sys.stderr,
+        ),
+        random_seed=args.seed,
+    )
+
+    scenarios = {
+        name: prepare for name, prepare in SCENARIOS.items()
+        if not args.scenario or name in args.scenario
+    }
+    results = {}
+    sys.stdout.write(
+        f"{'scenario':<{WIDTH}}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'req/s':>9}{'queries':>9}{'errors':>8}\n"
+    )
+    for transport in transports:
+        with sessions(transport, database_url, args) as new_session:
+            concurrency = args.concurrency if transport == 'gunicorn' else 1
+            for name, prepare in scenarios.items():
+                key = f'{transport} {name}'
+                result = results[key] = run_scenario(
+                    prepare, dataset, new_session, args.requests,
+                    concurrency, args.warmup,
+                )
+                sys.stdout.write(
+                    f"{key:<{WIDTH}}{result['p50_ms']:>9.2f}"
+                    f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                    f"{result['rps']:>9.1f}{result['queries'] or '-':>9}"
+                    f"{result['errors']:>8}\n"
+                )
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({
+                'options': {
+                    name: value for name, value in vars(args).items()
+                    if name not in ('save', 'baseline', 'database_url')
+                },
+                'results': results,
+            }, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            sys.stdout.write(f'regressions: {", ".join(regressions)}\n')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+End-to-end cost of ``RequestTimingMiddleware``: the same pages are requested
+through the test client with and without the middleware, interleaved, and
+the median difference is compared with ``REQUEST_TIMING_BUDGET_MS``.
+
+    uv run python -m benchmarks.request_timing --requests 500
+
+Unlike the ``timing_overhead_seconds`` metric this also includes the SQL
+execute wrapper, which runs once per query.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks import setup_django
+
+PAGES = ('/tasks/', '/statuses/', '/labels/', '/users/')
+MIDDLEWARE = 'task_manager.timing_middleware.RequestTimingMiddleware'
+
+
+def time_requests(client, url, count):
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args(argv)
+
+    setup_django(args.database_url)
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+
+    from benchmarks.seed import seed
+
+    call_command('migrate', verbosity=0)
+    seed(users=50, statuses=5, labels=10, tasks=500)
+
+    user = get_user_model().objects.first()
+    clients = {'with': Client(HTTP_HOST='localhost'),
+               'without': Client(HTTP_HOST='localhost')}
+    for client in clients.values():
+        client.force_login(user)
+    # a client builds its middleware chain once, on its first request
+    without = [name for name in settings.MIDDLEWARE if name != MIDDLEWARE]
+    with override_settings(MIDDLEWARE=without):
+        clients['without'].get('/')
+    clients['with'].get('/')
+
+    sys.stdout.write(f"{'median ms':<12}{'with':>10}{'without':>10}"
+                     f"{'overhead':>10}\n")
+    for url in PAGES:
+        results = {'with': [], 'without': []}
+        # alternate in small rounds so drift affects both sides alike
+        for _ in range(args.requests // 10):
+            for state, client in clients.items():
+                results[state] += time_requests(client, url, 10)
+        medians = {
+            state: statistics.median(values)
+            for state, values in results.items()
+        }
+        overhead = medians['with'] - medians['without']
+        sys.stdout.write(
+            f"{url:<12}{medians['with']:>10.2f}{medians['without']:>10.2f}"
+            f'{overhead:>10.3f}\n'
+        )
+    sys.stdout.write(f'budget: {settings.REQUEST_TIMING_BUDGET_MS} ms\n')
+
+
+if __name__ == '__main__':
+    main()
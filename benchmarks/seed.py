@@ -0,0 +1,102 @@
+"""Seed a database with a synthetic task manager dataset."""
+import random
+import sys
+import time
+
+BATCH_SIZE = 5000
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(
+    users=1000,
+    statuses=10,
+    labels=50,
+    tasks=100_000,
+    labels_per_task=2,
+    batch_size=BATCH_SIZE,
+    random_seed=0,
+    stdout=sys.stdout,
+):
+    """Bulk insert users, statuses, labels and tasks with label fan-out.
+
+    Returns the primary keys of the created users, statuses and labels.
+    Rows are streamed in batches, so memory does not grow with ``tasks``.
+    """
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+
+    from task_manager.labels.models import Label
+    from task_manager.statuses.models import Status
+    from task_manager.tasks.counters import reconcile
+    from task_manager.tasks.models import Task
+
+    User = get_user_model()
+    rng = random.Random(random_seed)
+    started = time.perf_counter()
+    password = make_password('benchmark')
+
+    user_ids = [
+        user.pk for user in User.objects.bulk_create(
+            User(
+                username=f'bench_user_{number}',
+                first_name=f'Name{number}',
+                last_name=f'Surname{number}',
+                password=password,
+            )
+            for number in range(users)
+        )
+    ]
+    status_ids = [
+        status.pk for status in Status.objects.bulk_create(
+            Status(name=f'Bench status {number}')
+            for number in range(statuses)
+        )
+    ]
+    label_ids = [
+        label.pk for label in Label.objects.bulk_create(
+            Label(name=f'Bench label {number}') for number in range(labels)
+        )
+    ]
+
+    Through = Task.labels.through
+    fan_out = min(labels_per_task, len(label_ids))
+    rows = (
+        Task(
+            name=f'Bench task {number}',
+            description=f'Generated task number {number}',
+            status_id=rng.choice(status_ids),
+            author_id=rng.choice(user_ids),
+            executor_id=rng.choice(user_ids) if rng.random() < 0.8 else None,
+        )
+        for number in range(tasks)
+    )
+    created = 0
+    for batch in _batches(rows, batch_size):
+        with transaction.atomic():
+            Task.objects.bulk_create(batch)
+            Through.objects.bulk_create(
+                Through(task_id=task.pk, label_id=label_id)
+                for task in batch
+                for label_id in rng.sample(label_ids, fan_out)
+            )
+        created += len(batch)
+        stdout.write(f'\rseeded {created}/{tasks} tasks')
+        stdout.flush()
+
+    # bulk_create skips the signals that maintain the task counters
+    reconcile()
+
+    elapsed = time.perf_counter() - started
+    stdout.write(f'\nseeding took {elapsed:.1f}s\n')
+    return user_ids, status_ids, label_ids
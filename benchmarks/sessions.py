@@ -0,0 +1,112 @@
+"""
+Database round trips per request for each session backend.
+
+    uv run python -m benchmarks.sessions --requests 200
+
+A signed-in client requests ``/tasks/`` and then renames a status, which
+flashes a message and redirects to the status list, once with each
+``SESSION_BACKEND``. Messages use the fallback storage, which keeps them in
+a cookie and touches the session only when they overflow it. The report
+shows the median queries per round (for the rename that is the POST and the
+page it redirects to), how many of them hit the session table, and the
+median time.
+"""
+import argparse
+import itertools
+import statistics
+import sys
+import time
+
+from benchmarks import setup_django
+
+SETUPS = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+WIDTH = 24
+
+
+def measure(client, request, count):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    queries = []
+    session_queries = []
+    timings = []
+    for _ in range(count):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            request(client)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context))
+        session_queries.append(sum(
+            'django_session' in query['sql'] for query in context
+        ))
+    return (
+        statistics.median(queries),
+        statistics.median(session_queries),
+        statistics.median(timings),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args(argv)
+
+    setup_django(args.database_url)
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+
+    from benchmarks.seed import seed
+    from task_manager.statuses.models import Status
+
+    call_command('migrate', verbosity=0)
+    seed(users=50, statuses=5, labels=10, tasks=args.tasks, stdout=sys.stderr)
+    user = get_user_model().objects.first()
+    status = Status.objects.first()
+    numbers = itertools.count()
+
+    def tasks_page(client):
+        response = client.get('/tasks/')
+        assert response.status_code == 200, response.status_code
+
+    def flash_and_redirect(client):
+        response = client.post(
+            f'/statuses/{status.pk}/update/',
+            {'name': f'Benchmark {next(numbers)}'},
+            follow=True,
+        )
+        assert response.status_code == 200, response.status_code
+
+    sys.stdout.write(
+        f"{'setup':<{WIDTH}}{'request':<22}{'queries':>8}"
+        f"{'session':>9}{'ms':>8}\n"
+    )
+    for name, engine in SETUPS.items():
+        with override_settings(SESSION_ENGINE=engine):
+            cache.clear()
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+            for label, request in (
+                ('GET /tasks/', tasks_page),
+                ('POST + redirect', flash_and_redirect),
+            ):
+                request(client)
+                queries, session, ms = measure(client, request, args.requests)
+                sys.stdout.write(
+                    f'{name:<{WIDTH}}{label:<22}{queries:>8g}'
+                    f'{session:>9g}{ms:>8.2f}\n'
+                )
+
+
+if __name__ == '__main__':
+    main()
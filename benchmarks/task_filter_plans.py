@@ -0,0 +1,113 @@
+"""
+Compare query plans of the task list filters before and after the
+composite indexes from ``tasks.0004_task_composite_indexes``.
+
+    uv run python -m benchmarks.task_filter_plans --tasks 1000000
+
+The database is migrated and seeded, migrated back to ``tasks.0003``,
+explained, migrated forward (which builds the indexes on the seeded rows)
+and explained again.
+"""
+import argparse
+import sys
+import time
+
+from benchmarks import setup_django
+
+BEFORE = ('tasks', '0003_alter_task_options_alter_task_author_and_more')
+AFTER = ('tasks', '0004_task_composite_indexes')
+PAGE_SIZE = 20
+TASK_COLUMNS = (
+    'name', 'description', 'status', 'author', 'executor', 'created_at'
+)
+REPEAT = 5
+
+
+def filter_combinations(status_id, user_id, label_id):
+    return {
+        'no filter': {},
+        'status': {'status': status_id},
+        'executor': {'executor': user_id},
+        'labels': {'labels': label_id},
+        'self_tasks': {'author': user_id},
+        'status + executor': {'status': status_id, 'executor': user_id},
+        'status + labels': {'status': status_id, 'labels': label_id},
+        'executor + labels': {'executor': user_id, 'labels': label_id},
+        'self_tasks + status': {'author': user_id, 'status': status_id},
+        'all filters': {
+            'status': status_id,
+            'executor': user_id,
+            'labels': label_id,
+            'author': user_id,
+        },
+    }
+
+
+def migrate_to(target):
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connection)
+    executor.migrate([target])
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def measure(lookups):
+    from task_manager.tasks.models import Task
+
+    # only the columns that exist at both migration states
+    queryset = Task.objects.only(*TASK_COLUMNS).filter(**lookups).order_by(
+        '-created_at', '-id'
+    )
+    page = queryset[:PAGE_SIZE]
+    plan = page.explain()
+
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        list(page.values_list('pk', flat=True))
+        timings.append(time.perf_counter() - started)
+    return plan, min(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--statuses', type=int, default=10)
+    parser.add_argument('--labels', type=int, default=100)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args(argv)
+
+    setup_django(args.database_url)
+
+    from django.core.management import call_command
+
+    from benchmarks.seed import seed
+
+    # seed with the current schema, then step back to compare the plans
+    call_command('migrate', verbosity=0)
+    user_ids, status_ids, label_ids = seed(
+        users=args.users,
+        statuses=args.statuses,
+        labels=args.labels,
+        tasks=args.tasks,
+    )
+    combos = filter_combinations(status_ids[0], user_ids[0], label_ids[0])
+
+    results = {}
+    for state, target in (('before', BEFORE), ('after', AFTER)):
+        migrate_to(target)
+        for name, lookups in combos.items():
+            results.setdefault(name, {})[state] = measure(lookups)
+
+    for name, states in results.items():
+        sys.stdout.write(f'\n== {name}\n')
+        for state in ('before', 'after'):
+            plan, millis = states[state]
+            sys.stdout.write(f'-- {state}: {millis:.2f} ms\n{plan}\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+First-request latency of a fresh worker with and without the template
+warm-up from ``task_manager.warmup``.
+
+    uv run python -m benchmarks.template_warmup --trials 10
+
+Every trial runs in a new interpreter that loads ``task_manager.wsgi`` (with
+``TEMPLATE_WARMUP`` off for cold and on for warm trials), primes URL routing
+and middleware with a template-free API request, then times the first
+request to each page.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import setup_django
+
+PAGES = {
+    'index': '/',
+    'login': '/login/',
+    'users': '/users/',
+    'statuses': '/statuses/',
+    'labels': '/labels/',
+    'tasks': '/tasks/',
+    'task create': '/tasks/create/',
+}
+
+
+def child():
+    started = time.perf_counter()
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+
+    import task_manager.wsgi  # noqa: F401
+    boot = time.perf_counter() - started
+
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(get_user_model().objects.first())
+    client.get('/api/statuses/')
+
+    timings = {'boot': boot * 1000}
+    for name, url in PAGES.items():
+        started = time.perf_counter()
+        response = client.get(url)
+        timings[name] = (time.perf_counter() - started) * 1000
+        assert response.status_code == 200, (url, response.status_code)
+    sys.stdout.write(json.dumps(timings))
+
+
+def run_trial(database_url, warm):
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        TEMPLATE_WARMUP='true' if warm else 'false',
+        BENCHMARK_CHILD='1',
+    )
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.template_warmup'],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--trials', type=int, default=10)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args(argv)
+
+    database_url = setup_django(args.database_url)
+
+    from django.core.management import call_command
+
+    from benchmarks.seed import seed
+
+    call_command('migrate', verbosity=0)
+    seed(users=50, statuses=5, labels=10, tasks=500)
+
+    results = {'cold': [], 'warm': []}
+    for _ in range(args.trials):
+        for state in results:
+            results[state].append(run_trial(database_url, state == 'warm'))
+
+    sys.stdout.write(f"\n{'median ms':<14}{'cold':>10}{'warm':>10}\n")
+    for name in ('boot', *PAGES):
+        medians = [
+            statistics.median(trial[name] for trial in results[state])
+            for state in ('cold', 'warm')
+        ]
+        sys.stdout.write(f'{name:<14}{medians[0]:>10.1f}{medians[1]:>10.1f}\n')
+    for state in ('cold', 'warm'):
+        first_requests = statistics.median(
+            sum(trial[name] for name in PAGES) for trial in results[state]
+        )
+        sys.stdout.write(f'{state} pages total: {first_requests:.1f} ms\n')
+
+
+if __name__ == '__main__':
+    if os.environ.get('BENCHMARK_CHILD'):
+        setup_django(os.environ['DATABASE_URL'])
+        child()
+    else:
+        main()
@@ -14,5 +14,12 @@ uv sync
 # Применяем миграции (КРИТИЧЕСКИ ВАЖНО!)
 uv run python manage.py migrate
 
-# Сборка статики
-uv run python manage.py collectstatic --noinput
\ No newline at end of file
+# Сборка статики: Bootstrap лежит в static/vendor, сверяем его хеши
+uv run python manage.py vendor_assets
+uv run python manage.py collectstatic --noinput
+
+# Проверяем, что все шаблоны компилируются
+uv run python manage.py compile_templates
+
+# Проверяем, что ни одна страница не подключает файл дважды
+uv run python manage.py check_assets
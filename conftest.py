@@ -2,9 +2,13 @@
 Configuration file for pytest.
 This helps pytest discover tests properly in a Django project.
 """
+import logging
 import os
+from collections import defaultdict
+from pathlib import Path
 
 import django
+import pytest
 
 # Make Django settings accessible to pytest
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
@@ -12,4 +16,128 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
 os.environ.setdefault("SECRET_KEY", "test-secret-key-for-pytest")
 os.environ.setdefault("DEBUG", "True")
 
-django.setup()
\ No newline at end of file
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+# The production PBKDF2 work factor made hashing test passwords the bulk of
+# the suite's run time. PBKDF2 stays listed for the hashes in the fixtures.
+settings.PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+]
+
+# Without DATABASE_REPLICA_URL a second SQLite database stands in for the
+# read replica. It gets its own test database, which no replication keeps in
+# sync, so reads only go to it in the tests that enable them.
+if "replica" not in settings.DATABASES:
+    from django.db import connections, router
+
+    from task_manager.settings import database_config
+
+    settings.DATABASES["replica"] = database_config(
+        f"sqlite:///{Path(__file__).resolve().parent / 'db-replica.sqlite3'}"
+    )
+    settings.DATABASE_ROUTERS = ["task_manager.replicas.ReplicaRouter"]
+    # both were read when pytest-django set Django up
+    connections.__dict__.pop("settings", None)
+    router.__dict__.pop("routers", None)
+settings.DATABASE_REPLICA_READS = False
+
+# The tests never run collectstatic, so there is no manifest of hashed names.
+settings.STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Loaded once into every test database instead of per TestCase class.
+SNAPSHOT_FIXTURES = ['users.json', 'statuses.json', 'labels.json']
+
+
+def load_snapshot(names, using='default'):
+    """Insert the objects of the named fixtures with one bulk_create per
+    model, replacing rows left by an earlier run of a reused database."""
+    from django.apps import apps
+    from django.core import serializers
+    from django.core.management.color import no_style
+    from django.db import connections, transaction
+
+    objects = defaultdict(list)
+    for name in names:
+        path = next(
+            path for app in apps.get_app_configs()
+            if (path := Path(app.path, 'fixtures', name)).exists()
+        )
+        with open(path, encoding='utf-8') as stream:
+            for item in serializers.deserialize('json', stream, using=using):
+                objects[type(item.object)].append(item.object)
+
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        for model, rows in reversed(objects.items()):
+            model.objects.using(using).filter(
+                pk__in=[row.pk for row in rows]
+            )._raw_delete(using)
+        for model, rows in objects.items():
+            model.objects.using(using).bulk_create(rows)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), list(objects)
+            ):
+                cursor.execute(sql)
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """
+    Seed each test database (one per xdist worker) once per session.
+
+    The rows are committed, so every TestCase rolls back to them instead of
+    loading fixtures again for each class.
+    """
+    with django_db_blocker.unblock():
+        load_snapshot(SNAPSHOT_FIXTURES)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Empty the caches, since rolled back test data may be cached."""
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def n_plus_one_guard():
+    """
+    Run requests through the query inspector and fail the test if any of
+    them repeated a SELECT shape N_PLUS_ONE_THRESHOLD times or more.
+    """
+    from django.test import override_settings
+
+    findings = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            if record.query['event'] == 'n_plus_one':
+                findings.append(record.query)
+
+    handler = Collect()
+    logger = logging.getLogger('task_manager.queries')
+    logger.addHandler(handler)
+    try:
+        with override_settings(QUERY_INSPECTOR=True):
+            yield findings
+    finally:
+        logger.removeHandler(handler)
+
+    if findings:
+        pytest.fail('N+1 queries:\n' + '\n'.join(
+            f"{finding['method']} {finding['path']}: {finding['count']}x "
+            f"{finding['sql']}\n  templates: {finding['templates']}"
+            f"\n  code: {finding['code']}"
+            for finding in findings
+        ), pytrace=False)
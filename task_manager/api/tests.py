@@ -0,0 +1,166 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+class ApiTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status1 = Status.objects.get(pk=1)
+        self.status2 = Status.objects.get(pk=2)
+        self.label = Label.objects.get(pk=1)
+        self.tasks = []
+        for number in range(5):
+            task = Task.objects.create(
+                name=f'Task {number}',
+                description='Long description',
+                status=self.status1 if number % 2 else self.status2,
+                author=self.user1 if number < 3 else self.user2,
+            )
+            self.tasks.append(task)
+        self.tasks[0].labels.add(self.label)
+        self.client.force_login(self.user1)
+
+    def get(self, name, params=None, **headers):
+        return self.client.get(reverse(name), params, headers=headers)
+
+    def test_login_required_except_users(self):
+        """Test that only the user list is readable anonymously"""
+        self.client.logout()
+        self.assertEqual(self.get('api_tasks').status_code, 403)
+        self.assertEqual(self.get('api_statuses').status_code, 403)
+        self.assertEqual(self.get('api_users').status_code, 200)
+
+    def test_task_list(self):
+        """Test that tasks are listed newest first with related ids"""
+        results = self.get('api_tasks').json()['results']
+
+        self.assertEqual(
+            [task['id'] for task in results],
+            [task.pk for task in reversed(self.tasks)]
+        )
+        first = results[-1]
+        self.assertEqual(first['status'], self.status2.pk)
+        self.assertEqual(first['author'], self.user1.pk)
+        self.assertEqual(first['labels'], [self.label.pk])
+
+    def test_sparse_fields_select_only_their_columns(self):
+        """Test that fields= limits both the output and the SELECT"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.get('api_tasks', {'fields': 'id,name'})
+
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'name'})
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('tasks_task_labels', sql)
+
+    def test_unknown_field(self):
+        """Test that an unknown field name is rejected"""
+        response = self.get('api_tasks', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_pagination(self):
+        """Test that following next links visits every task once"""
+        seen = []
+        url = reverse('api_tasks') + '?limit=2&fields=id'
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(task['id'] for task in data['results'])
+            url = data['next']
+
+        self.assertEqual(seen, [task.pk for task in reversed(self.tasks)])
+
+    def test_task_filters(self):
+        """Test that the task list filters apply to the API"""
+        results = self.get(
+            'api_tasks', {'status': self.status1.pk, 'self_tasks': 'on'}
+        ).json()['results']
+        self.assertEqual([task['id'] for task in results], [self.tasks[1].pk])
+
+        response = self.get('api_tasks', {'status': 999})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail(self):
+        """Test the detail endpoints and their 404"""
+        response = self.client.get(
+            reverse('api_status', args=[self.status1.pk])
+        )
+        self.assertEqual(response.json()['name'], self.status1.name)
+
+        response = self.client.get(reverse('api_task', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get(self):
+        """Test that a matching ETag is answered with 304 from one query"""
+        response = self.get('api_tasks')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertNotIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get('api_tasks', If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        # the session and the page; the user comes from the cache
+        self.assertEqual(len(context.captured_queries), 2)
+        self.assertFalse(any(
+            'COUNT(' in query['sql'].upper()
+            for query in context.captured_queries
+        ))
+
+        # a 200 selects the page once, for the tag and the body
+        with CaptureQueriesContext(connection) as context:
+            self.get('api_tasks', {'fields': 'id,name'})
+        self.assertEqual(len(context.captured_queries), 2)
+
+        url = reverse('api_task', args=[self.tasks[0].pk])
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        response = self.client.get(
+            url, headers={'If-Modified-Since': response['Last-Modified']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_expire_the_etag(self):
+        """Test that task and label changes produce a new ETag"""
+        etag = self.get('api_tasks')['ETag']
+
+        self.tasks[1].labels.add(self.label)
+        response = self.get('api_tasks', If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.tasks[1].name = 'Renamed'
+        self.tasks[1].save()
+        response = self.get('api_tasks', If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # a bulk update sends no signals, like a write seen by another worker
+        etag = response['ETag']
+        Task.objects.filter(pk=self.tasks[2].pk).update(
+            name='Elsewhere', updated_at=timezone.now()
+        )
+        response = self.get('api_tasks', If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        Task.objects.filter(pk=self.tasks[3].pk)._raw_delete('default')
+        response = self.get('api_tasks', If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # other resources keep their tags
+        etag = self.get('api_statuses')['ETag']
+        Task.objects.create(
+            name='New', status=self.status1, author=self.user1
+        )
+        response = self.get('api_statuses', If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
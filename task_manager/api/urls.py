@@ -0,0 +1,18 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('tasks/', views.TasksApiView.as_view(), name='api_tasks'),
+    path('tasks/<int:pk>/', views.TasksApiView.as_view(), name='api_task'),
+    path('statuses/', views.StatusesApiView.as_view(), name='api_statuses'),
+    path(
+        'statuses/<int:pk>/',
+        views.StatusesApiView.as_view(),
+        name='api_status'
+    ),
+    path('labels/', views.LabelsApiView.as_view(), name='api_labels'),
+    path('labels/<int:pk>/', views.LabelsApiView.as_view(), name='api_label'),
+    path('users/', views.UsersApiView.as_view(), name='api_users'),
+    path('users/<int:pk>/', views.UsersApiView.as_view(), name='api_user'),
+]
@@ -0,0 +1,248 @@
+"""
+Read-only JSON API.
+
+Every resource is a list under ``/api/<resource>/`` and a detail view under
+``/api/<resource>/<pk>/``. ``fields=a,b`` picks the fields to return (and the
+columns to select), lists are paginated with opaque ``cursor`` tokens and
+``limit``. The ETag of a list is a hash of the ``(id, updated_at)`` of the
+page it shows, which is selected once and reused for the body; a detail
+view gets its ETag and Last-Modified from the ``updated_at`` of its row. So
+every worker sees a change as soon as it is committed, without counting
+the table.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.http import JsonResponse
+from django.utils.functional import cached_property
+from django.views import View
+from django.views.decorators.http import condition
+
+from task_manager.labels.models import Label
+from task_manager.pagination import InvalidCursor, KeysetPaginator
+from task_manager.statuses.models import Status
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class ResourceView(View):
+    resource = None
+    model = None
+    # API field name -> column passed to values(), None when the field is
+    # filled in by serialize()
+    fields = {}
+    ordering = ('id',)
+    login_required = True
+    default_limit = 50
+    max_limit = 200
+
+    def get(self, request, pk=None):
+        if self.login_required and not request.user.is_authenticated:
+            return JsonResponse(
+                {'error': 'Вы не авторизованы! Пожалуйста, выполните вход.'},
+                status=403
+            )
+
+        try:
+            respond = condition(
+                etag_func=self.get_etag,
+                last_modified_func=self.get_last_modified,
+            )(self.respond)
+            return respond(request, pk)
+        except ApiError as error:
+            return JsonResponse({'error': error.message}, status=error.status)
+
+    @cached_property
+    def changes(self):
+        """Whether the requested row exists and when it last changed."""
+        return self.get_queryset().filter(pk=self.kwargs['pk']).aggregate(
+            count=Count('pk'), updated_at=Max('updated_at')
+        )
+
+    @cached_property
+    def page(self):
+        """The page of a list response, selected with its rows' updated_at."""
+        queryset = self.get_queryset().values(
+            *self.get_columns(self.get_fields()), 'updated_at'
+        )
+        paginator = KeysetPaginator(queryset, self.get_limit(), self.ordering)
+        try:
+            return paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise ApiError('Неверный курсор страницы')
+
+    def get_etag(self, request, pk):
+        # A change to a row moves its updated_at, and adding or deleting one
+        # changes the rows of the page (or the count for a detail view), so
+        # equal tags mean byte-identical bodies for the same request and user.
+        if pk is None:
+            state = [(row['id'], row['updated_at']) for row in self.page]
+        else:
+            state = [self.changes['count'], self.changes['updated_at']]
+        key = '|'.join([
+            self.resource,
+            repr(state),
+            str(pk),
+            request.GET.urlencode(),
+            str(request.user.pk),
+        ])
+        return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+    def get_last_modified(self, request, pk):
+        # A deletion leaves the latest updated_at of a list where it was, so
+        # only a single row can be validated by date.
+        if pk is None:
+            return None
+        return self.changes['updated_at']
+
+    def respond(self, request, pk):
+        try:
+            fields = self.get_fields()
+            if pk is not None:
+                data = self.get_detail(pk, fields)
+            else:
+                data = self.get_list(fields)
+        except ApiError as error:
+            return JsonResponse({'error': error.message}, status=error.status)
+        return JsonResponse(data, encoder=DjangoJSONEncoder)
+
+    def get_fields(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.fields)
+
+        fields = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Неизвестные поля: {', '.join(unknown)}")
+        return fields
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_columns(self, fields):
+        columns = {self.fields[name] for name in fields} - {None}
+        # the primary key and the sort key are needed for the cursor
+        columns.update(field.lstrip('-') for field in self.ordering)
+        return sorted(columns)
+
+    def get_detail(self, pk, fields):
+        rows = list(
+            self.get_queryset().filter(pk=pk).values(*self.get_columns(fields))
+        )
+        if not rows:
+            raise ApiError('Не найдено', status=404)
+        return self.serialize(rows, fields)[0]
+
+    def get_list(self, fields):
+        page = self.page
+        return {
+            'results': self.serialize(page.object_list, fields),
+            'next': self.page_url(page.next_cursor),
+            'previous': self.page_url(page.previous_cursor),
+        }
+
+    def serialize(self, rows, fields):
+        return [
+            {name: row[self.fields[name] or name] for name in fields}
+            for row in rows
+        ]
+
+    def page_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{query.urlencode()}'
+        )
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+
+class TasksApiView(ResourceView):
+    resource = 'tasks'
+    model = Task
+    fields = {
+        'id': 'id',
+        'name': 'name',
+        'description': 'description',
+        'status': 'status_id',
+        'author': 'author_id',
+        'executor': 'executor_id',
+        'labels': None,
+        'created_at': 'created_at',
+    }
+    ordering = ('-created_at', '-id')
+
+    def get_queryset(self):
+        # Same filters as the task list, including its self_tasks checkbox.
+        filterset = TaskFilter(
+            self.request.GET or None,
+            queryset=super().get_queryset(),
+            request=self.request,
+        )
+        if filterset.is_bound and not filterset.is_valid():
+            raise ApiError(filterset.errors.get_json_data())
+
+        queryset = filterset.qs
+        if self.request.GET.get('self_tasks'):
+            queryset = queryset.filter(author=self.request.user)
+        return queryset
+
+    def serialize(self, rows, fields):
+        if 'labels' in fields:
+            # one query for the labels of the whole page
+            labels = {row['id']: [] for row in rows}
+            through = Task.labels.through.objects.filter(
+                task_id__in=labels
+            ).order_by('label_id')
+            for task_id, label_id in through.values_list(
+                'task_id', 'label_id'
+            ):
+                labels[task_id].append(label_id)
+            for row in rows:
+                row['labels'] = labels[row['id']]
+        return super().serialize(rows, fields)
+
+
+class StatusesApiView(ResourceView):
+    resource = 'statuses'
+    model = Status
+    fields = {'id': 'id', 'name': 'name', 'created_at': 'created_at'}
+
+
+class LabelsApiView(ResourceView):
+    resource = 'labels'
+    model = Label
+    fields = {'id': 'id', 'name': 'name', 'created_at': 'created_at'}
+
+
+class UsersApiView(ResourceView):
+    resource = 'users'
+    model = User
+    fields = {
+        'id': 'id',
+        'username': 'username',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'date_joined': 'date_joined',
+    }
+    # the user list is public, like the users page
+    login_required = False
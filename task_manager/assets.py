@@ -0,0 +1,145 @@
+"""
+Front-end assets.
+
+Bootstrap is served from our own static files instead of a CDN. The
+release is committed under ``static/vendor`` and pinned in ``VENDOR_ASSETS``
+with its Subresource Integrity hashes; ``manage.py vendor_assets`` fails when
+a file is missing or does not match. collectstatic then stores hashed,
+compressed copies, which WhiteNoise serves as immutable for a year.
+
+``manage.py check_assets`` runs at build time and fails when a template
+pulls the same asset twice (counting everything it extends or includes, and
+the ``bootstrap_css``/``bootstrap_javascript`` tags) or links a static file
+that does not exist, which the manifest storage would turn into an error on
+every page.
+"""
+import base64
+import hashlib
+import re
+from collections import Counter
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlsplit
+
+from django.contrib.staticfiles import finders
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+
+# Bootstrap 5.3.8, the dist files of the npm package. The CSS and bundle
+# hashes are the ones published on getbootstrap.com; the source maps, which
+# have none, are pinned by the hash of the release files.
+VENDOR_ASSETS = {
+    'vendor/bootstrap/css/bootstrap.min.css': (
+        'sha384-sRIl4kxILFvY47J16cr9ZwB07vP4J8+LH7qKQnuqkuIAvNWLzeN8tE5YBujZ'
+        'qJLB'
+    ),
+    'vendor/bootstrap/css/bootstrap.min.css.map': (
+        'sha384-IGzRD4jINKs2iSsOq2MORajTvAmIsb5zZ1DXovbJoJdvmiCcdj9KLJocCj0T'
+        'S60/'
+    ),
+    'vendor/bootstrap/js/bootstrap.bundle.min.js': (
+        'sha384-FKyoEForCGlyvwx9Hj09JcYn3nv7wiPVlz7YYwJrWVcXK/BmnVDxM+D2scQb'
+        'ITxI'
+    ),
+    'vendor/bootstrap/js/bootstrap.bundle.min.js.map': (
+        'sha384-QB4naBpk637xz9/VYF2efmUFYCi3L/fh1z0dHyy3J2/lh/CQ5Xk7VRdBI59Q'
+        'bkxv'
+    ),
+}
+
+STATIC_TAG = re.compile(r'''{%\s*static\s+(['"])(?P<path>[^'"]+)\1\s*%}''')
+ASSET_TAG = re.compile(
+    r'''<(?:script|link)\b[^>]*?\b(?:src|href)=(['"])(?P<url>[^'"]+)\1''',
+    re.IGNORECASE,
+)
+STATIC_ASSET = re.compile(
+    r'''<(?:script|link)\b[^>]*?{%\s*static\s+(['"])(?P<path>[^'"]+)\1''',
+    re.IGNORECASE,
+)
+BOOTSTRAP_TAG = re.compile(r'{%\s*bootstrap_(?P<kind>css|javascript)\s*%}')
+PARENT_TAG = re.compile(
+    r'''{%\s*(?:extends|include)\s+(['"])(?P<name>[^'"]+)\1'''
+)
+
+
+def integrity(content, algorithm='sha384'):
+    digest = hashlib.new(algorithm, content).digest()
+    return f'{algorithm}-{base64.b64encode(digest).decode()}'
+
+
+def bootstrap_asset(kind):
+    from django_bootstrap5.core import get_bootstrap_setting
+
+    return get_bootstrap_setting(f'{kind}_url')['url']
+
+
+def asset_name(url):
+    """The file name an asset is known by, wherever it is served from."""
+    return PurePosixPath(urlsplit(url).path).name
+
+
+class TemplateAssets:
+    """The script and link tags of the templates in ``directories``."""
+
+    def __init__(self, directories):
+        self.directories = [Path(directory) for directory in directories]
+        self._own = {}
+
+    def names(self):
+        for directory in self.directories:
+            for path in sorted(directory.rglob('*.html')):
+                yield path.relative_to(directory).as_posix()
+
+    def source(self, name):
+        for directory in self.directories:
+            path = directory / name
+            if path.is_file():
+                return path.read_text(encoding='utf-8')
+        return None
+
+    def own(self, name):
+        """Assets of the template itself, and the templates it pulls in."""
+        if name not in self._own:
+            source = self.source(name) or ''
+            assets = [
+                asset_name(bootstrap_asset(match['kind']))
+                for match in BOOTSTRAP_TAG.finditer(source)
+            ]
+            plain = STATIC_TAG.sub(lambda match: match['path'], source)
+            assets += [
+                asset_name(match['url'])
+                for match in ASSET_TAG.finditer(plain)
+            ]
+            parents = [match['name'] for match in PARENT_TAG.finditer(source)]
+            self._own[name] = (assets, parents)
+        return self._own[name]
+
+    def all(self, name, seen=()):
+        assets, parents = self.own(name)
+        assets = list(assets)
+        for parent in parents:
+            if parent not in seen:
+                assets += self.all(parent, (*seen, name))
+        return assets
+
+    def duplicates(self):
+        """{template: [asset, ...]} for assets a page would load twice."""
+        found = {}
+        for name in self.names():
+            counts = Counter(asset for asset in self.all(name) if asset)
+            repeated = sorted(asset for asset, n in counts.items() if n > 1)
+            if repeated:
+                found[name] = repeated
+        return found
+
+    def missing(self):
+        """{template: [path, ...]} for static files that do not exist."""
+        found = {}
+        for name in self.names():
+            paths = {
+                match['path']
+                for match in STATIC_ASSET.finditer(self.source(name))
+            }
+            absent = sorted(path for path in paths if not finders.find(path))
+            if absent:
+                found[name] = absent
+        return found
@@ -0,0 +1,160 @@
+"""
+Background error reporting.
+
+The request thread only captures the exception and a few request details
+and puts them on a bounded queue; a daemon worker thread sends them in
+batches. When the queue is full new reports are dropped and counted rather
+than slowing the failing request down.
+
+Reports go to Rollbar, or as JSON lines to ``ROLLBAR_FILE`` when that is set
+(tests and local runs). Without a real Rollbar token and without a file
+``build_reporter`` returns None and nothing is reported at all.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# The token settings.py falls back to when none is configured.
+PLACEHOLDER_TOKEN = 'ROOLBAR_TOKEN'
+
+
+@dataclass
+class Report:
+    exc_info: tuple
+    payload_data: dict = field(default_factory=dict)
+    extra_data: dict = field(default_factory=dict)
+
+
+class RollbarTransport:
+    def __init__(self, options):
+        import rollbar
+
+        # Sending happens on the worker thread, so rollbar itself may block.
+        rollbar.init(**{**options, 'handler': 'blocking'})
+        self.rollbar = rollbar
+
+    def send(self, reports):
+        for report in reports:
+            self.rollbar.report_exc_info(
+                report.exc_info,
+                extra_data=report.extra_data,
+                payload_data=report.payload_data,
+            )
+
+
+class FileTransport:
+    """Append every report to a file as one JSON object per line."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, reports):
+        lines = []
+        for report in reports:
+            cls, exc, tb = report.exc_info
+            lines.append(json.dumps({
+                'exception': {'class': cls.__name__, 'message': str(exc)},
+                'trace': ''.join(traceback.format_exception(cls, exc, tb)),
+                **report.payload_data,
+                'custom': report.extra_data,
+            }, default=str) + '\n')
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.writelines(lines)
+
+
+class BackgroundReporter:
+    def __init__(
+        self, transport, queue_size=1000, batch_size=20, flush_interval=1.0,
+        autostart=True,
+    ):
+        self.transport = transport
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.autostart = autostart
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def report(self, report):
+        """Queue a report without ever blocking; False if it was dropped."""
+        if self.autostart:
+            self.start()
+        try:
+            self.queue.put_nowait(report)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def start(self):
+        # Started on first use and again after a fork, since threads do not
+        # survive into the children of a preloading server.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name='error-reporter', daemon=True
+            )
+            self._thread.start()
+
+    def flush(self, timeout=None):
+        """Wait until every queued report has been handed to the transport."""
+        done = threading.Event()
+
+        def wait():
+            self.queue.join()
+            done.set()
+
+        threading.Thread(target=wait, daemon=True).start()
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            # collect whatever else arrives within flush_interval
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                while len(batch) < self.batch_size:
+                    timeout = max(deadline - time.monotonic(), 0)
+                    batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+
+            try:
+                self.transport.send(batch)
+            except Exception:
+                logger.exception('Could not send %d error reports', len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+def build_reporter():
+    path = settings.ROLLBAR_FILE
+    if path:
+        transport = FileTransport(path)
+    elif settings.ROLLBAR['access_token'] not in ('', PLACEHOLDER_TOKEN):
+        transport = RollbarTransport(settings.ROLLBAR)
+    else:
+        return None
+
+    return BackgroundReporter(
+        transport,
+        queue_size=settings.ROLLBAR_QUEUE_SIZE,
+        batch_size=settings.ROLLBAR_BATCH_SIZE,
+    )
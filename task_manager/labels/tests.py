@@ -10,8 +10,6 @@ User = get_user_model()
 
 
 class LabelCRUDTests(TestCase):
-    fixtures = ['users.json', 'statuses.json']
-
     def setUp(self):
         self.user = User.objects.get(pk=1)
         self.user.set_password('testpass123')
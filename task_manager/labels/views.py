@@ -14,6 +14,7 @@ class LabelsIndexView(LoginRequiredMixin, ListView):
     model = Label
     template_name = 'labels/index.html'
     context_object_name = 'labels'
+    replica_reads = True
 
     def handle_no_permission(self):
         messages.error(
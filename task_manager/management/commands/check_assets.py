@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+
+from task_manager.assets import TemplateAssets
+
+
+class Command(BaseCommand):
+    help = (
+        'Fail when a template loads the same asset twice or links a static '
+        'file that does not exist.'
+    )
+
+    def handle(self, *args, **options):
+        assets = TemplateAssets(engines['django'].dirs)
+        problems = [
+            f'{name}: {asset} is loaded more than once'
+            for name, found in assets.duplicates().items()
+            for asset in found
+        ] + [
+            f'{name}: static file {path} does not exist'
+            for name, found in assets.missing().items()
+            for path in found
+        ]
+        if problems:
+            raise CommandError('\n'.join(problems))
+        self.stdout.write('No duplicate or missing assets')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateSyntaxError
+
+from task_manager.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Compile every project template, failing on syntax errors.'
+
+    def handle(self, *args, **options):
+        try:
+            count, elapsed = warm_templates()
+        except TemplateSyntaxError as error:
+            raise CommandError(f'Template error: {error}') from error
+        self.stdout.write(
+            f'Compiled {count} templates in {elapsed * 1000:.1f} ms'
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.assets import STATIC_DIR, VENDOR_ASSETS, integrity
+
+
+class Command(BaseCommand):
+    help = (
+        'Fail when a third-party asset in static/vendor is missing or does '
+        'not match its pinned integrity hash.'
+    )
+
+    def handle(self, *args, **options):
+        problems = []
+        for name, expected in VENDOR_ASSETS.items():
+            path = STATIC_DIR / name
+            if not path.is_file():
+                problems.append(f'{name} does not exist')
+            elif integrity(path.read_bytes()) != expected:
+                problems.append(f'{name} does not match {expected}')
+        if problems:
+            raise CommandError('\n'.join(problems))
+        self.stdout.write(f'{len(VENDOR_ASSETS)} vendored assets match')
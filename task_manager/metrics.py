@@ -0,0 +1,180 @@
+"""
+In-process request metrics.
+
+``Histogram`` is a log-linear histogram in the spirit of HdrHistogram: each
+power-of-two range of values is split into ``2 ** precision`` equal buckets,
+so any quantile is accurate to about ``1 / 2 ** precision`` of its value at
+a fixed, small memory cost. ``registry`` keeps one histogram per metric and
+view; ``render_prometheus`` exposes them as Prometheus summaries, together with
+the statistics of pooled database connections.
+
+Metrics are per process: with several gunicorn workers every worker reports
+its own numbers and Prometheus adds them up.
+"""
+import math
+import threading
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# name -> (help text, divisor turning the recorded integers into the unit)
+METRICS = {
+    'request_seconds': ('Wall time of the request.', 1e6),
+    'db_queries': ('SQL queries run by the request.', 1),
+    'db_seconds': ('Time spent in SQL queries.', 1e6),
+    'template_seconds': ('Time spent rendering the template response.', 1e6),
+    'timing_overhead_seconds': (
+        'Time the timing middleware itself adds to the request.', 1e6
+    ),
+}
+PREFIX = 'task_manager_'
+
+# name -> (type, help text, function of the psycopg_pool statistics)
+POOL_METRICS = {
+    'db_pool_size': (
+        'gauge', 'Open connections in the pool.',
+        lambda stats: stats.get('pool_size', 0),
+    ),
+    'db_pool_in_use': (
+        'gauge', 'Connections lent to a thread.',
+        lambda stats: stats.get('pool_size', 0)
+        - stats.get('pool_available', 0),
+    ),
+    'db_pool_waiting': (
+        'gauge', 'Threads waiting for a connection.',
+        lambda stats: stats.get('requests_waiting', 0),
+    ),
+    'db_pool_requests_total': (
+        'counter', 'Connections requested from the pool.',
+        lambda stats: stats.get('requests_num', 0),
+    ),
+    'db_pool_wait_seconds_total': (
+        'counter', 'Time spent waiting for a connection.',
+        lambda stats: stats.get('requests_wait_ms', 0) / 1000,
+    ),
+    'db_pool_errors_total': (
+        'counter', 'Requests that got no connection in time.',
+        lambda stats: stats.get('requests_errors', 0),
+    ),
+    'db_pool_connect_seconds_total': (
+        'counter', 'Time spent opening new connections.',
+        lambda stats: stats.get('connections_ms', 0) / 1000,
+    ),
+}
+
+
+class Histogram:
+    def __init__(self, precision=5):
+        self.sub_buckets = 1 << precision
+        self.precision = precision
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+
+    def record(self, value):
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q):
+        if not self.count:
+            return 0
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return self._middle(index)
+        return self._middle(max(self.counts))
+
+    def _index(self, value):
+        if value < self.sub_buckets:
+            return value
+        shift = value.bit_length() - self.precision - 1
+        return (shift + 1) * self.sub_buckets + (value >> shift) - (
+            self.sub_buckets
+        )
+
+    def _middle(self, index):
+        if index < self.sub_buckets:
+            return index
+        shift = index // self.sub_buckets - 1
+        lower = (index % self.sub_buckets + self.sub_buckets) << shift
+        return lower + ((1 << shift) - 1) / 2
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def record(self, view, values):
+        """Record ``{metric: value}`` for one request to ``view``."""
+        with self.lock:
+            for name, value in values.items():
+                key = (name, view)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram()
+                self.histograms[key].record(value)
+
+    def get(self, name, view):
+        return self.histograms.get((name, view))
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+
+registry = Registry()
+
+
+def get_pool_stats():
+    """psycopg_pool statistics of every pooled database, by alias."""
+    from django.db import connections
+
+    stats = {}
+    for connection in connections.all():
+        # only the PostgreSQL backend has a pool, and only when configured
+        pool = getattr(connection, 'pool', None)
+        if pool is not None:
+            stats[connection.alias] = pool.get_stats()
+    return stats
+
+
+def render_prometheus(registry=registry, pool_stats=None):
+    if pool_stats is None:
+        pool_stats = get_pool_stats()
+    lines = []
+    with registry.lock:
+        for name, (help_text, divisor) in METRICS.items():
+            views = sorted(
+                view for metric, view in registry.histograms if metric == name
+            )
+            if not views:
+                continue
+            metric = PREFIX + name
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} summary')
+            for view in views:
+                histogram = registry.histograms[(name, view)]
+                label = f'view="{view}"'
+                for q in QUANTILES:
+                    value = histogram.quantile(q) / divisor
+                    lines.append(
+                        f'{metric}{{{label},quantile="{q}"}} {value:g}'
+                    )
+                lines.append(
+                    f'{metric}_sum{{{label}}} {histogram.total / divisor:g}'
+                )
+                lines.append(f'{metric}_count{{{label}}} {histogram.count}')
+
+    for name, (kind, help_text, value) in POOL_METRICS.items():
+        if not pool_stats:
+            break
+        metric = PREFIX + name
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for alias, stats in sorted(pool_stats.items()):
+            lines.append(f'{metric}{{database="{alias}"}} {value(stats):g}')
+    return '\n'.join(lines) + '\n'
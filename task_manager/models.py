@@ -0,0 +1,26 @@
+class TaskCountersMixin:
+    """
+    Keep denormalized task counters out of ordinary saves.
+
+    The counters are only changed with atomic ``F()`` updates when tasks
+    change; writing back the value loaded with the instance (e.g. from an
+    edit form) would undo concurrent increments.
+    """
+
+    counter_fields = ()
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if (
+            update_fields is None
+            and self.pk is not None
+            and not self._state.adding
+        ):
+            # deferred fields are skipped as a plain save() would skip them
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
@@ -0,0 +1,168 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor, paginator):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.paginator = paginator
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last seen sort key instead of
+    using OFFSET, so every page costs the same no matter how deep it is.
+
+    The ordering must be unique (end it with the primary key) and all of its
+    fields must sort in the same direction. Cursors are opaque url-safe
+    tokens; the total count is only computed when somebody asks for it.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id')):
+        directions = {field.startswith('-') for field in ordering}
+        if len(directions) != 1:
+            raise ValueError('Keyset ordering must use a single direction.')
+
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.descending = directions.pop()
+        self.fields = tuple(field.lstrip('-') for field in ordering)
+
+    @cached_property
+    def count(self):
+        return self.queryset.count()
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._forward_page(None)
+
+        values, backwards = self.decode_cursor(cursor)
+        if backwards:
+            return self._backward_page(values)
+        return self._forward_page(values)
+
+    def encode_cursor(self, item, backwards=False):
+        payload = {
+            'k': [self._value(item, field) for field in self.fields],
+            'b': backwards,
+        }
+        data = json.dumps(payload, default=self._dump, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            keys = payload['k']
+            backwards = bool(payload['b'])
+        except (
+            binascii.Error, UnicodeError, ValueError, KeyError, TypeError
+        ) as error:
+            raise InvalidCursor('Malformed cursor.') from error
+
+        if not isinstance(keys, list) or len(keys) != len(self.fields):
+            raise InvalidCursor('Cursor does not match the ordering.')
+
+        opts = self.queryset.model._meta
+        try:
+            values = [
+                self._model_field(opts, field).to_python(value)
+                for field, value in zip(self.fields, keys)
+            ]
+        except ValidationError as error:
+            raise InvalidCursor('Malformed cursor.') from error
+        return values, backwards
+
+    def _forward_page(self, values):
+        queryset = self.queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, after=True))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        next_cursor = None
+        previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1])
+        if rows and values is not None:
+            previous_cursor = self.encode_cursor(rows[0], backwards=True)
+        return KeysetPage(rows, next_cursor, previous_cursor, self)
+
+    def _backward_page(self, values):
+        reverse_ordering = [
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        ]
+        queryset = self.queryset.order_by(*reverse_ordering).filter(
+            self._seek(values, after=False)
+        )
+
+        rows = list(queryset[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+
+        next_cursor = None
+        previous_cursor = None
+        if rows:
+            next_cursor = self.encode_cursor(rows[-1])
+            if has_previous:
+                previous_cursor = self.encode_cursor(rows[0], backwards=True)
+        return KeysetPage(rows, next_cursor, previous_cursor, self)
+
+    def _seek(self, values, after):
+        # (a, b) after (x, y) in descending order is a < x OR (a = x AND b < y)
+        lookup = 'lt' if after == self.descending else 'gt'
+        condition = Q()
+        for index, field in enumerate(self.fields):
+            step = Q(**{f'{field}__{lookup}': values[index]})
+            for previous, value in zip(self.fields[:index], values):
+                step &= Q(**{previous: value})
+            condition |= step
+        return condition
+
+    @staticmethod
+    def _model_field(opts, name):
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    @staticmethod
+    def _dump(value):
+        # DjangoJSONEncoder drops microseconds, which would make the cursor
+        # skip rows created within the same millisecond.
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _value(item, field):
+        if isinstance(item, dict):
+            return item[field]
+        return getattr(item, field)
@@ -0,0 +1,157 @@
+"""
+Slow query log and N+1 detector for development and staging.
+
+``QueryInspector`` wraps the execution of every SQL query, groups the
+queries of one request by their shape (the SQL with parameter lists
+collapsed) and reports to the ``task_manager.queries`` logger:
+
+* ``n_plus_one``: the same SELECT shape ran ``N_PLUS_ONE_THRESHOLD`` times
+  or more, with the template and code locations that issued it;
+* ``slow_query``: a single query took ``SLOW_QUERY_MS`` or longer.
+
+Every log record carries the report as ``record.query``; ``JsonFormatter``
+writes it as one JSON object per line. ``QueryInspectorMiddleware`` is
+enabled with ``QUERY_INSPECTOR=true``; the ``n_plus_one_guard`` fixture in
+``conftest.py`` fails a test whose requests show an N+1 pattern.
+"""
+import json
+import logging
+import re
+import sys
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Node
+
+logger = logging.getLogger('task_manager.queries')
+
+HERE = Path(__file__).resolve()
+PROJECT_DIR = str(HERE.parent)
+IGNORED_FILES = (str(HERE), str(HERE.with_name('timing_middleware.py')))
+PLACEHOLDERS = re.compile(r'\((?:%s|\?)(?:, (?:%s|\?))*\)')
+
+
+def get_shape(sql):
+    """The query with IN lists of any length reduced to one form."""
+    return PLACEHOLDERS.sub('(...)', sql)
+
+
+def get_stack():
+    """Template locations and project code frames, innermost first."""
+    templates = []
+    code = []
+    frame = sys._getframe(2)
+    while frame is not None:
+        node = frame.f_locals.get('self')
+        filename = frame.f_code.co_filename
+        if isinstance(node, Node) and getattr(node, 'token', None):
+            origin = node.origin
+            name = origin.template_name or origin.name
+            location = f'{name}:{node.token.lineno}'
+            if location not in templates:
+                templates.append(location)
+        elif filename.startswith(PROJECT_DIR) and filename not in (
+            IGNORED_FILES
+        ):
+            code.append(
+                f'{Path(filename).relative_to(PROJECT_DIR).as_posix()}:'
+                f'{frame.f_lineno} in {frame.f_code.co_name}'
+            )
+        frame = frame.f_back
+    return {'templates': templates, 'code': code}
+
+
+class QueryInspector:
+    def __init__(self, threshold=None, slow_ms=None):
+        self.threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        self.slow = (slow_ms or settings.SLOW_QUERY_MS) / 1000
+        self.shapes = Counter()
+        self.stacks = {}
+        self.reports = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - started
+            shape = get_shape(sql)
+            self.shapes[shape] += 1
+            if duration >= self.slow:
+                self.reports.append({
+                    'event': 'slow_query',
+                    'sql': sql,
+                    'duration_ms': round(duration * 1000, 2),
+                    'database': context['connection'].alias,
+                    **get_stack(),
+                })
+            if (
+                self.shapes[shape] == self.threshold
+                and shape.lstrip().upper().startswith('SELECT')
+            ):
+                self.stacks[shape] = get_stack()
+
+    def n_plus_one(self):
+        return [
+            {
+                'event': 'n_plus_one',
+                'sql': shape,
+                'count': self.shapes[shape],
+                **stack,
+            }
+            for shape, stack in self.stacks.items()
+        ]
+
+    def log(self, **context):
+        """Log every finding with ``context`` (method, path, view)."""
+        for report in self.n_plus_one() + self.reports:
+            report = {**context, **report}
+            logger.warning(
+                '%s: %s', report['event'], report['sql'],
+                extra={'query': report},
+            )
+
+
+class QueryInspectorMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not settings.QUERY_INSPECTOR:
+            raise MiddlewareNotUsed('The query inspector is disabled.')
+
+    def __call__(self, request):
+        with QueryInspector() as inspector:
+            response = self.get_response(request)
+        match = request.resolver_match
+        inspector.log(
+            method=request.method,
+            path=request.path,
+            view=match.url_name if match else None,
+        )
+        return response
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = getattr(record, 'query', None)
+        if data is None:
+            data = {'message': record.getMessage()}
+        return json.dumps({
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            **data,
+        }, ensure_ascii=False)
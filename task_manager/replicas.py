@@ -0,0 +1,80 @@
+"""
+Read replica routing.
+
+With ``DATABASE_REPLICA_URL`` set the ``replica`` alias exists and
+``ReplicaMiddleware`` sends the reads of views marked ``replica_reads =
+True`` to it, for GET and HEAD requests only. Everything else, writes
+included, uses ``default``.
+
+A client that has just written something reads from the primary for
+``REPLICA_STICKY_SECONDS``, so it never misses its own change because the
+replica lags behind. The window is kept in a cookie, which costs no session
+write.
+"""
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA = 'replica'
+STICKY_COOKIE = 'primary_until'
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return REPLICA if replica_reads.get() else None
+
+    def db_for_write(self, model, **hints):
+        # also for objects that were read from the replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if (
+            REPLICA not in settings.DATABASES
+            or not settings.DATABASE_REPLICA_READS
+        ):
+            raise MiddlewareNotUsed('No read replica is configured.')
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            token = getattr(request, '_replica_token', None)
+            if token is not None:
+                replica_reads.reset(token)
+
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            window = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                STICKY_COOKIE, str(int(time.time() + window)),
+                max_age=window, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            getattr(view_class, 'replica_reads', False)
+            and request.method in ('GET', 'HEAD')
+            and not self.is_sticky(request)
+        ):
+            # the session and the user always come from the primary
+            request.user.is_authenticated
+            request._replica_token = replica_reads.set(True)
+
+    def is_sticky(self, request):
+        try:
+            until = int(request.COOKIES.get(STICKY_COOKIE, 0))
+        except ValueError:
+            return False
+        return until > time.time()
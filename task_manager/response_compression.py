@@ -0,0 +1,266 @@
+"""
+Compression of dynamic responses.
+
+WhiteNoise serves static files precompressed; ``CompressionMiddleware`` does
+the same for pages and API responses on the fly. It picks the encoding from
+``Accept-Encoding`` among brotli, gzip and zstd (where Python 3.14's
+``compression.zstd`` or backports.zstd is available), respecting q-values
+and breaking ties by the order of ``COMPRESSION_LEVELS``.
+
+Responses shorter than ``COMPRESSION_MIN_SIZE``, already encoded, marked
+``no-transform`` or of a type that does not compress are left alone.
+Streaming responses (the task export) are compressed as they are sent and
+flushed every ``COMPRESSION_FLUSH_SIZE`` bytes of input, so the client keeps
+receiving data without the whole body ever being held in memory. The levels
+come from ``benchmarks.compression``, run on our own pages.
+
+Pages carry a CSRF token and echo search input, which is what a BREACH
+attack needs to read secrets off compressed lengths. As Django's
+``GZipMiddleware`` does, every response gets a random number of padding
+bytes, below ``COMPRESSION_MAX_PADDING``, where the decoder skips them: in
+the gzip file name, a brotli metadata block or a zstd skippable frame.
+"""
+import secrets
+import struct
+import zlib
+
+import brotli
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/x-ndjson',
+    'image/svg+xml',
+)
+
+
+class Gzip:
+    encoding = 'gzip'
+
+    def __init__(self, level, padding=0):
+        self.padding = padding
+        # raw deflate; the header and trailer are written here
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self.crc = 0
+        self.size = 0
+
+    def header(self):
+        if not self.padding:
+            return b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+        # FNAME flag, then the zero-terminated "file name"
+        return (
+            b'\x1f\x8b\x08\x08\x00\x00\x00\x00\x00\xff'
+            + b'a' * self.padding + b'\x00'
+        )
+
+    def compress(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush(zlib.Z_FINISH) + struct.pack(
+            '<II', self.crc, self.size & 0xFFFFFFFF
+        )
+
+
+class Brotli:
+    encoding = 'br'
+
+    def __init__(self, level, padding=0):
+        self.padding = padding
+        self.compressor = brotli.Compressor(
+            mode=brotli.MODE_TEXT, quality=level
+        )
+
+    def header(self):
+        if not self.padding:
+            return b''
+        # The flush ends the stream header on a byte boundary; a metadata
+        # block of up to 256 bytes follows (ISLAST 0, MNIBBLES 0,
+        # MSKIPBYTES 1, MSKIPLEN - 1 over two bytes).
+        skip = min(self.padding, 256) - 1
+        return (
+            self.compressor.flush()
+            + bytes((0x16 | (skip & 3) << 6, skip >> 2))
+            + b'\x00' * (skip + 1)
+        )
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class Zstd:
+    encoding = 'zstd'
+
+    def __init__(self, level, padding=0):
+        self.padding = padding
+        self.compressor = zstd.ZstdCompressor(level)
+
+    def header(self):
+        if not self.padding:
+            return b''
+        # a skippable frame: magic number, length, content
+        return struct.pack('<II', 0x184D2A50, self.padding) + (
+            b'\x00' * self.padding
+        )
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zstd.ZstdCompressor.FLUSH_BLOCK)
+
+    def finish(self):
+        return self.compressor.flush(zstd.ZstdCompressor.FLUSH_FRAME)
+
+
+ENCODERS = {
+    encoder.encoding: encoder
+    for encoder in (Zstd, Brotli, Gzip)
+    if encoder is not Zstd or zstd is not None
+}
+
+
+def parse_accept_encoding(header):
+    """{coding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header, encodings):
+    """
+    The first of ``encodings`` with the highest q-value in ``header``, or
+    None when the client accepts none of them.
+    """
+    accepted = parse_accept_encoding(header)
+    best = None
+    best_q = 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(content, encoder):
+    return encoder.header() + encoder.compress(content) + encoder.finish()
+
+
+def compress_stream(chunks, encoder, flush_size):
+    yield encoder.header()
+    pending = 0
+    for chunk in chunks:
+        data = encoder.compress(chunk)
+        pending += len(chunk)
+        if pending >= flush_size:
+            data += encoder.flush()
+            pending = 0
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not settings.RESPONSE_COMPRESSION:
+            raise MiddlewareNotUsed('Response compression is disabled.')
+        self.levels = {
+            encoding: level
+            for encoding, level in settings.COMPRESSION_LEVELS.items()
+            if encoding in ENCODERS
+        }
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.headers.get('Accept-Encoding', ''), self.levels
+        )
+        if encoding is None:
+            return response
+        encoder = ENCODERS[encoding](
+            self.levels[encoding], self.get_padding()
+        )
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content,
+                encoder,
+                settings.COMPRESSION_FLUSH_SIZE,
+            )
+            # the compressed length is only known at the end
+            del response.headers['Content-Length']
+        else:
+            content = compress(response.content, encoder)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers['Content-Length'] = str(len(content))
+
+        # The body is no longer byte for byte what a strong ETag promised.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def get_padding(self):
+        if not settings.COMPRESSION_MAX_PADDING:
+            return 0
+        return secrets.randbelow(settings.COMPRESSION_MAX_PADDING)
+
+    def is_compressible(self, response):
+        if response.has_header('Content-Encoding'):
+            return False
+        if getattr(response, 'is_async', False):
+            # an async iterator under ASGI; the site runs on WSGI
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        return response.streaming or (
+            len(response.content) >= settings.COMPRESSION_MIN_SIZE
+        )
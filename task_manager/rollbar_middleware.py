@@ -1,7 +1,50 @@
-from rollbar.contrib.django.middleware import RollbarNotifierMiddleware
+import sys
 
+from django.core.exceptions import MiddlewareNotUsed
+
+from task_manager.error_reporting import Report, build_reporter
+
+
+class CustomRollbarNotifierMiddleware:
+    """
+    Report unhandled view exceptions to Rollbar from a background thread.
+
+    Only the exception and a few request details are captured in the request
+    thread; see ``task_manager.error_reporting``. Without a Rollbar token
+    (or ``ROLLBAR_FILE``) the middleware removes itself from the chain.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.reporter = build_reporter()
+        if self.reporter is None:
+            raise MiddlewareNotUsed('Rollbar is not configured.')
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exc):
+        self.reporter.report(Report(
+            exc_info=sys.exc_info(),
+            payload_data={
+                'request': self.get_request_data(request),
+                **self.get_payload_data(request, exc),
+            },
+            extra_data=self.get_extra_data(request, exc),
+        ))
+
+    def get_request_data(self, request):
+        return {
+            'url': request.build_absolute_uri(),
+            'method': request.method,
+            'GET': request.GET.dict(),
+            'user_ip': request.META.get('REMOTE_ADDR'),
+            'headers': {
+                'User-Agent': request.headers.get('User-Agent', ''),
+                'Referer': request.headers.get('Referer', ''),
+            },
+        }
 
-class CustomRollbarNotifierMiddleware(RollbarNotifierMiddleware):
     def get_extra_data(self, request, exc):
         extra_data = dict()
 
@@ -30,4 +73,4 @@ class CustomRollbarNotifierMiddleware(RollbarNotifierMiddleware):
                 },
             }
 
-        return payload_data
\ No newline at end of file
+        return payload_data
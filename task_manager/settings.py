@@ -12,10 +12,10 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 
 import os
+import tempfile
 from pathlib import Path
 
 import dj_database_url
-import rollbar
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -57,20 +57,25 @@ INSTALLED_APPS = [
     'task_manager.statuses',
     'task_manager.tasks',
     'task_manager.labels',
+    'task_manager.api',
 ]
 
 AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
+    'task_manager.timing_middleware.RequestTimingMiddleware',
+    'task_manager.querylog.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'task_manager.response_compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'task_manager.user_cache.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'task_manager.rollbar_middleware.CustomRollbarNotifierMiddleware',
+    'task_manager.replicas.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'task_manager.urls'
@@ -79,39 +84,145 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / "task_manager" / "templates"],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled templates are kept for the life of the process; with
+            # DEBUG the autoreloader empties the cache when a file changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'task_manager.wsgi.application'
 
+# Compile every project template when a WSGI worker starts (see wsgi.py).
+TEMPLATE_WARMUP = os.getenv('TEMPLATE_WARMUP', 'true').lower() != 'false'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
 
-if DATABASE_URL.startswith("sqlite"):
-    DATABASES = {
-        "default": dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+# PostgreSQL connections live for DB_CONN_MAX_AGE seconds and are checked
+# before reuse. With DB_POOL=true every process instead keeps a psycopg pool
+# of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections shared by its threads; a
+# request waits up to DB_POOL_TIMEOUT seconds for one.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 600))
+DB_SSL_REQUIRE = os.getenv('DB_SSL_REQUIRE', str(not DEBUG)).lower() == 'true'
+DB_POOL = os.getenv('DB_POOL', 'false').lower() == 'true'
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', 300))
+
+
+def database_config(url):
+    if url.startswith("sqlite"):
+        return dj_database_url.parse(url, conn_max_age=600)
+
+    config = dj_database_url.parse(
+        url,
+        # Django requires non-persistent connections with a pool
+        conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+        ssl_require=DB_SSL_REQUIRE
+    )
+    if DB_POOL:
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+            "max_idle": DB_POOL_MAX_IDLE,
+        }
+    return config
+
+
+DATABASES = {
+    "default": database_config(DATABASE_URL)
+}
+
+# A read replica for the list and detail pages (task_manager/replicas.py).
+# A client reads from the primary for REPLICA_STICKY_SECONDS after a write.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+DATABASE_REPLICA_READS = True
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = database_config(DATABASE_REPLICA_URL)
+    DATABASE_ROUTERS = ["task_manager.replicas.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Rendered task rows live in the default cache, keyed by the updated_at of
+# what they show, so a per-process cache never serves them stale. The user
+# list page and the choice lists follow version stamps kept in the same
+# cache. Local memory is per process; with several gunicorn workers use
+# CACHE_BACKEND=file so every worker shares the entries and the stamps.
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv(
+                'CACHE_LOCATION',
+                os.path.join(tempfile.gettempdir(), 'task_manager_cache')
+            ),
+            'OPTIONS': {'MAX_ENTRIES': 50000},
+        }
     }
 else:
-    DATABASES = {
-        "default": dj_database_url.parse(
-            DATABASE_URL, 
-            conn_max_age=600, 
-            ssl_require=not DEBUG
-        )
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
     }
 
 
+# Sessions and messages
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+# SESSION_BACKEND=db reads the session table on every signed-in request.
+# cached_db serves sessions from the default cache and reads the table only
+# on a miss (writes go to both); it needs a cache that every worker shares,
+# or a logout in one worker would not end the session in the others, so it
+# is the default only with CACHE_BACKEND=file. signed_cookies keeps the
+# session in a signed cookie and never touches the database, at the price
+# of a logged-out cookie staying valid until it expires. Expired rows of the
+# session table are removed by `manage.py clearsessions` (make
+# clearsessions), which should run daily.
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_BACKEND = os.getenv(
+    'SESSION_BACKEND', 'cached_db' if CACHE_BACKEND == 'file' else 'db'
+)
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+
+# Seconds the signed-in user row stays cached for request.user (0 loads it
+# on every request); see task_manager/user_cache.py.
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', 60))
+
+# Messages travel in a cookie of their own, so flashing one does not save
+# the session; only messages too large for the cookie fall back to it
+# instead of being dropped, as CookieStorage alone would do.
+MESSAGE_STORAGE = 'django.contrib.messages.storage.fallback.FallbackStorage'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -135,7 +246,24 @@ STATIC_URL = 'static/'
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# collectstatic stores content-hashed, pre-compressed copies of the static
+# files, which WhiteNoise serves with a one-year immutable Cache-Control.
+# Pages can only be rendered after collectstatic then, so scripts that skip
+# it set STATIC_MANIFEST=false.
+STATIC_MANIFEST = os.getenv('STATIC_MANIFEST', 'true').lower() != 'false'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage'
+            if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -146,13 +274,95 @@ LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
+# 'offset' numbers the pages of the task list, 'keyset' pages it by cursor
+# on (created_at, id) and never counts the whole filtered set.
+TASKS_PAGINATION = os.getenv('TASKS_PAGINATION', 'offset')
+
+# Seconds a process keeps the status and label choice lists at most; a
+# change reaches the other workers at once only with a shared cache.
+CHOICES_CACHE_TIMEOUT = int(os.getenv('CHOICES_CACHE_TIMEOUT', 60))
+
+# Seconds a rendered task list row stays cached; rows are also dropped as
+# soon as the task, its status or its author/executor change.
+TASK_ROW_CACHE_TIMEOUT = int(os.getenv('TASK_ROW_CACHE_TIMEOUT', 24 * 60 * 60))
+
+# Seconds the user list rendered for anonymous visitors stays cached (0
+# turns the cache off); a user change drops it right away.
+USERS_PAGE_CACHE_TIMEOUT = int(os.getenv('USERS_PAGE_CACHE_TIMEOUT', 30))
+
+# Request timing: the Server-Timing header, the bearer token guarding
+# /metrics/ (closed without one unless DEBUG or METRICS_PUBLIC) and the time
+# the timing middleware itself may add to a request.
+SERVER_TIMING_HEADER = (
+    os.getenv('SERVER_TIMING_HEADER', 'true').lower() != 'false'
+)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_PUBLIC = os.getenv('METRICS_PUBLIC', 'false').lower() == 'true'
+REQUEST_TIMING_BUDGET_MS = float(os.getenv('REQUEST_TIMING_BUDGET_MS', 0.5))
+
+# Compression of pages and API responses
+# (task_manager/response_compression.py). COMPRESSION_LEVELS lists the
+# encodings in order of preference with their levels, chosen with
+# benchmarks/compression.py: the most bytes saved while a 20 KiB page takes
+# under 0.5 ms and the CSV export compresses at 40 MiB/s or more. Responses
+# under COMPRESSION_MIN_SIZE are sent as they are; streamed ones are flushed
+# every COMPRESSION_FLUSH_SIZE bytes of input.
+# Every compressed response is padded by a random number of bytes below
+# COMPRESSION_MAX_PADDING, so its length does not give away the CSRF token
+# (BREACH); 0 turns the padding off.
+RESPONSE_COMPRESSION = (
+    os.getenv('RESPONSE_COMPRESSION', 'true').lower() != 'false'
+)
+COMPRESSION_LEVELS = {
+    'br': int(os.getenv('COMPRESSION_BR_LEVEL', 4)),
+    'zstd': int(os.getenv('COMPRESSION_ZSTD_LEVEL', 6)),
+    'gzip': int(os.getenv('COMPRESSION_GZIP_LEVEL', 6)),
+}
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_FLUSH_SIZE = int(os.getenv('COMPRESSION_FLUSH_SIZE', 64 * 1024))
+COMPRESSION_MAX_PADDING = int(os.getenv('COMPRESSION_MAX_PADDING', 100))
+
+# Opt-in N+1 and slow query log (task_manager/querylog.py), written as JSON
+# lines to QUERY_LOG_FILE or to stderr.
+QUERY_INSPECTOR = os.getenv('QUERY_INSPECTOR', 'false').lower() == 'true'
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', 3))
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 100))
+QUERY_LOG_FILE = os.getenv('QUERY_LOG_FILE')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'task_manager.querylog.JsonFormatter'},
+    },
+    'handlers': {
+        'queries': {
+            'class': 'logging.FileHandler',
+            'filename': QUERY_LOG_FILE,
+            'formatter': 'json',
+        } if QUERY_LOG_FILE else {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'task_manager.queries': {
+            'handlers': ['queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 ROLLBAR = {
     'access_token': os.getenv('ROLLBAR_ACCESS_TOKEN', 'ROOLBAR_TOKEN'),
     'environment': os.getenv('ROLLBAR_ENV', 'development'),
     'code_version': '1.0',
-    'root': BASE_DIR,
+    'root': str(BASE_DIR),
 }
 
-
-if ROLLBAR['access_token']:
-    rollbar.init(**ROLLBAR)
\ No newline at end of file
+# Errors are sent from a background thread (task_manager/error_reporting.py)
+# and only with a real token. ROLLBAR_FILE writes them to a file instead.
+ROLLBAR_FILE = os.getenv('ROLLBAR_FILE')
+ROLLBAR_QUEUE_SIZE = int(os.getenv('ROLLBAR_QUEUE_SIZE', 1000))
+ROLLBAR_BATCH_SIZE = int(os.getenv('ROLLBAR_BATCH_SIZE', 20))
\ No newline at end of file
@@ -0,0 +1,61 @@
+// Turns <select data-autocomplete-url="..."> into a searchable picker that
+// loads its options from the autocomplete endpoint instead of the page.
+(function () {
+  'use strict';
+
+  var DELAY = 250;
+
+  function replaceOptions(select, results) {
+    var keep = Array.prototype.filter.call(select.options, function (option) {
+      return option.selected || option.value === '';
+    });
+    var kept = keep.map(function (option) { return option.value; });
+
+    select.innerHTML = '';
+    keep.forEach(function (option) { select.appendChild(option); });
+    results.forEach(function (result) {
+      if (kept.indexOf(String(result.id)) === -1) {
+        select.appendChild(new Option(result.text, result.id));
+      }
+    });
+  }
+
+  function attach(select) {
+    var input = document.createElement('input');
+    var timer = null;
+    var controller = null;
+
+    input.type = 'search';
+    input.className = 'form-control mb-1';
+    input.placeholder = 'Поиск';
+    input.setAttribute('aria-label', 'Поиск');
+    select.parentNode.insertBefore(input, select);
+
+    function load() {
+      var url = select.dataset.autocompleteUrl +
+        '?q=' + encodeURIComponent(input.value.trim());
+      if (controller) {
+        controller.abort();
+      }
+      controller = new AbortController();
+      fetch(url, {
+        credentials: 'same-origin',
+        signal: controller.signal,
+        headers: {'Accept': 'application/json'}
+      })
+        .then(function (response) { return response.json(); })
+        .then(function (data) { replaceOptions(select, data.results || []); })
+        .catch(function () {});
+    }
+
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(load, DELAY);
+    });
+    input.addEventListener('focus', load, {once: true});
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(attach);
+  });
+})();
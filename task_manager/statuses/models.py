@@ -1,7 +1,9 @@
 from django.db import models
 
+from task_manager.models import TaskCountersMixin
 
-class Status(models.Model):
+
+class Status(TaskCountersMixin, models.Model):
     name = models.CharField(
         max_length=100,
         unique=True,
@@ -11,6 +13,17 @@ class Status(models.Model):
         auto_now_add=True,
         verbose_name='Дата создания'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+    tasks_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Задачи'
+    )
+
+    counter_fields = ('tasks_count',)
 
     class Meta:
         verbose_name = 'Статус'
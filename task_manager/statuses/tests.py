@@ -8,8 +8,6 @@ User = get_user_model()
 
 
 class StatusCRUDTests(TestCase):
-    fixtures = ['users.json']
-
     def setUp(self):
         self.user = User.objects.get(pk=1)
         self.user.set_password('testpass123')
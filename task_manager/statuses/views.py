@@ -14,6 +14,7 @@ class StatusesIndexView(LoginRequiredMixin, ListView):
     model = Status
     template_name = 'statuses/index.html'
     context_object_name = 'statuses'
+    replica_reads = True
 
     def handle_no_permission(self):
         messages.error(
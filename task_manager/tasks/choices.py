@@ -0,0 +1,83 @@
+import django_filters
+from django import forms
+from django.conf import settings
+from django.forms.models import ModelChoiceIterator
+from django_filters import fields as filter_fields
+
+from task_manager import versioning
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+
+def _statuses():
+    return tuple(Status.objects.values_list('pk', 'name'))
+
+
+def _labels():
+    return tuple(Label.objects.values_list('pk', 'name'))
+
+
+LOADERS = {
+    'statuses': _statuses,
+    'labels': _labels,
+}
+
+
+def get_choices(name):
+    """Return cached ``(pk, label)`` pairs for statuses or labels."""
+    return versioning.local_cache(
+        f'choices:{name}', LOADERS[name], settings.CHOICES_CACHE_TIMEOUT
+    )
+
+
+def invalidate_choices(name):
+    versioning.invalidate(f'choices:{name}')
+
+
+class CachedChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_choices(self.field.choices_name)
+
+    def __len__(self):
+        empty = 1 if self.field.empty_label is not None else 0
+        return len(get_choices(self.field.choices_name)) + empty
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(
+            get_choices(self.field.choices_name)
+        )
+
+
+class CachedFilterChoiceIterator(
+    filter_fields.ModelChoiceIterator,
+    CachedChoiceIterator
+):
+    pass
+
+
+class CachedChoicesMixin:
+    """
+    Render choices from the process-local cache instead of iterating the
+    queryset; submitted values are still validated against the queryset.
+    """
+
+    def __init__(self, *args, choices_name, **kwargs):
+        self.choices_name = choices_name
+        super().__init__(*args, **kwargs)
+
+
+class CachedModelChoiceField(CachedChoicesMixin, forms.ModelChoiceField):
+    iterator = CachedChoiceIterator
+
+
+class CachedFilterChoiceField(
+    CachedChoicesMixin,
+    filter_fields.ModelChoiceField
+):
+    iterator = CachedFilterChoiceIterator
+
+
+class CachedModelChoiceFilter(django_filters.ModelChoiceFilter):
+    field_class = CachedFilterChoiceField
@@ -0,0 +1,124 @@
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from task_manager import versioning
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+from .models import Task
+
+User = get_user_model()
+
+# Task foreign key -> the denormalized counter it feeds.
+TASK_COUNTERS = {
+    'status': (Status, 'tasks_count'),
+    'author': (User, 'authored_tasks_count'),
+    'executor': (User, 'assigned_tasks_count'),
+}
+LABEL_COUNTER = (Label, 'tasks_count')
+BATCH_SIZE = 500
+
+
+def adjust(model, field, deltas, using='default'):
+    """
+    Apply ``{pk: delta}`` to a counter with one UPDATE per distinct delta.
+
+    The counter is changed with an ``F()`` expression, so concurrent
+    transactions never overwrite each other's increments.
+    """
+    pks_by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            pks_by_delta[delta].append(pk)
+
+    for delta, pks in pks_by_delta.items():
+        value = F(field) + delta
+        if delta < 0:
+            value = Greatest(value, Value(0))
+        for start in range(0, len(pks), BATCH_SIZE):
+            model._base_manager.using(using).filter(
+                pk__in=pks[start:start + BATCH_SIZE]
+            ).update(**{field: value})
+
+
+def task_deltas(values, sign=1):
+    """
+    Count the foreign keys of tasks, given as dicts keyed by field name.
+
+    Returns ``{field: Counter({pk: delta})}`` ready to be passed to
+    ``apply_task_deltas``.
+    """
+    deltas = {field: Counter() for field in TASK_COUNTERS}
+    for row in values:
+        for field in TASK_COUNTERS:
+            if row.get(field) is not None:
+                deltas[field][row[field]] += sign
+    return deltas
+
+
+def apply_task_deltas(deltas, using='default'):
+    users_changed = False
+    for field, counter in deltas.items():
+        model, counter_field = TASK_COUNTERS[field]
+        adjust(model, counter_field, counter, using)
+        users_changed |= model is User and any(counter.values())
+    if users_changed:
+        # the cached user list shows these counters
+        versioning.invalidate('users')
+
+
+def adjust_labels(deltas, using='default'):
+    model, field = LABEL_COUNTER
+    adjust(model, field, deltas, using)
+
+
+def actual_counts():
+    """Yield ``(model, counter field, expression counting the tasks)``."""
+    through = Task.labels.through
+    sources = [
+        (model, field, Task, name)
+        for name, (model, field) in TASK_COUNTERS.items()
+    ]
+    sources.append((*LABEL_COUNTER, through, 'label'))
+
+    for model, field, source, column in sources:
+        counted = (
+            source._base_manager
+            .filter(**{column: OuterRef('pk')})
+            .order_by()
+            .values(column)
+            .annotate(count=Count('*'))
+            .values('count')
+        )
+        yield model, field, Coalesce(Subquery(counted), Value(0))
+
+
+def reconcile(dry_run=False, using='default'):
+    """
+    Recount every counter from the tasks and fix the rows that drifted.
+
+    Returns a list of ``(model, counter field, number of drifted rows)``.
+    """
+    report = []
+    with transaction.atomic(using=using):
+        for model, field, actual in actual_counts():
+            drifted = (
+                model._base_manager.using(using)
+                .annotate(actual=actual)
+                .exclude(**{field: F('actual')})
+            )
+            pks = list(drifted.values_list('pk', flat=True))
+            if not dry_run:
+                for start in range(0, len(pks), BATCH_SIZE):
+                    batch = pks[start:start + BATCH_SIZE]
+                    model._base_manager.using(using).filter(
+                        pk__in=batch
+                    ).update(**{field: actual})
+            report.append((model, field, len(pks)))
+            if model is User and pks and not dry_run:
+                versioning.invalidate('users')
+    return report
@@ -4,15 +4,28 @@ from django.contrib.auth import get_user_model
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
+from task_manager.widgets import AutocompleteSelect
 
+from .choices import CachedModelChoiceFilter
 from .models import Task
+from .search import search_tasks
 
 User = get_user_model()
 
 
 class TaskFilter(django_filters.FilterSet):
-    status = django_filters.ModelChoiceFilter(
+    q = django_filters.CharFilter(
+        method='filter_search',
+        label='Поиск',
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Название или описание'
+        })
+    )
+
+    status = CachedModelChoiceFilter(
         queryset=Status.objects.all(),
+        choices_name='statuses',
         field_name='status',
         lookup_expr='exact',
         empty_label='Статус',
@@ -26,7 +39,7 @@ class TaskFilter(django_filters.FilterSet):
         lookup_expr='exact',
         empty_label='Исполнитель',
         label='Исполнитель',
-        widget=forms.Select(attrs={'class': 'form-control'})
+        widget=AutocompleteSelect('users', attrs={'class': 'form-control'})
     )
     
     labels = django_filters.ModelChoiceFilter(
@@ -35,9 +48,12 @@ class TaskFilter(django_filters.FilterSet):
         lookup_expr='exact',
         empty_label='Метка',
         label='Метка',
-        widget=forms.Select(attrs={'class': 'form-control'})
+        widget=AutocompleteSelect('labels', attrs={'class': 'form-control'})
     )
 
     class Meta:
         model = Task
-        fields = ['status', 'executor', 'labels']
\ No newline at end of file
+        fields = ['status', 'executor', 'labels']
+
+    def filter_search(self, queryset, name, value):
+        return search_tasks(queryset, value)
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Row formats shared by the task import command and the task export.
+
+A task travels as a flat record of ``COLUMNS``: the status, author and
+executor by name (username for users) and the labels as a list of names.
+In CSV the labels are one cell joined with ``LABEL_SEPARATOR``. Exports
+also carry the id and creation time, which imports ignore.
+"""
+import csv
+import json
+
+FORMATS = ('csv', 'jsonl')
+COLUMNS = ('name', 'description', 'status', 'author', 'executor', 'labels')
+EXPORT_COLUMNS = ('id', *COLUMNS, 'created_at')
+LABEL_SEPARATOR = ','
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class FormatError(ValueError):
+    pass
+
+
+def guess_format(filename):
+    for format in FORMATS:
+        if filename.lower().endswith(f'.{format}'):
+            return format
+    return None
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        labels = row.get('labels') or ''
+        row['labels'] = [
+            label.strip()
+            for label in labels.split(LABEL_SEPARATOR)
+            if label.strip()
+        ]
+        yield row
+
+
+def read_jsonl(stream):
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            raise FormatError(f'line {number}: {error}') from error
+        if not isinstance(row, dict):
+            raise FormatError(f'line {number}: expected a JSON object')
+        for column in COLUMNS[:-1]:
+            if not isinstance(row.get(column), (str, type(None))):
+                raise FormatError(f'line {number}: {column} must be a string')
+        labels = row.get('labels') or []
+        if isinstance(labels, str):
+            labels = labels.split(LABEL_SEPARATOR)
+        elif not (
+            isinstance(labels, list)
+            and all(isinstance(label, str) for label in labels)
+        ):
+            raise FormatError(
+                f'line {number}: labels must be a string or a list of strings'
+            )
+        row['labels'] = [label.strip() for label in labels if label.strip()]
+        yield row
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+
+def read_rows(stream, format):
+    """Lazily yield one dict per task read from a text stream."""
+    return READERS[format](stream)
+
+
+def task_record(task):
+    return {
+        'id': task.pk,
+        'name': task.name,
+        'description': task.description,
+        'status': task.status.name,
+        'author': task.author.username,
+        'executor': task.executor.username if task.executor else None,
+        'labels': [label.name for label in task.labels.all()],
+        'created_at': task.created_at.isoformat(),
+    }
+
+
+class Echo:
+    """A file-like object handing back whatever is written to it."""
+
+    def write(self, value):
+        return value
+
+
+def write_csv(records):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for record in records:
+        record['labels'] = LABEL_SEPARATOR.join(record['labels'])
+        yield writer.writerow(record[column] for column in EXPORT_COLUMNS)
+
+
+def write_jsonl(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl}
+
+
+def write_rows(records, format):
+    """Lazily serialize task records into chunks of text."""
+    return WRITERS[format](records)
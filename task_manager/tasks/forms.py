@@ -3,7 +3,9 @@ from django.contrib.auth import get_user_model
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
+from task_manager.widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
+from .choices import CachedModelChoiceField
 from .models import Task
 
 User = get_user_model()
@@ -28,8 +30,9 @@ class TaskForm(forms.ModelForm):
             'placeholder': 'Описание'
         })
     )
-    status = forms.ModelChoiceField(
+    status = CachedModelChoiceField(
         queryset=Status.objects.all(),
+        choices_name='statuses',
         required=True,
         label='Статус',
         widget=forms.Select(attrs={'class': 'form-control'})
@@ -38,13 +41,16 @@ class TaskForm(forms.ModelForm):
         queryset=User.objects.all(),
         required=False,
         label='Исполнитель',
-        widget=forms.Select(attrs={'class': 'form-control'})
+        widget=AutocompleteSelect('users', attrs={'class': 'form-control'})
     )
     labels = forms.ModelMultipleChoiceField(
         queryset=Label.objects.all(),
         required=False,
         label='Метки',
-        widget=forms.SelectMultiple(attrs={'class': 'form-control'})
+        widget=AutocompleteSelectMultiple(
+            'labels',
+            attrs={'class': 'form-control'}
+        )
     )
 
     class Meta:
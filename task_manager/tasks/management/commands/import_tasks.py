@@ -0,0 +1,208 @@
+import io
+import sys
+import time
+from collections import Counter
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters
+from task_manager.tasks.formats import (
+    FORMATS,
+    FormatError,
+    guess_format,
+    read_rows,
+)
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+def peak_memory():
+    try:
+        # Unix only; on Windows the import still runs, without the figure
+        import resource
+    except ImportError:
+        return 'n/a'
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return f'{peak / divisor:.1f} MB'
+
+
+class Command(BaseCommand):
+    help = (
+        'Import tasks from CSV or JSON Lines with columns name, description, '
+        'status, author, executor and labels (names, usernames for users).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default='-',
+            help='File to read; "-" or nothing reads standard input.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Input format; guessed from the file extension by default.',
+        )
+        parser.add_argument(
+            '--author',
+            help='Username to use as author for rows without one.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per INSERT statement.',
+        )
+        parser.add_argument(
+            '--transaction-size',
+            type=int,
+            default=10000,
+            help='Rows committed per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format = options['format'] or guess_format(path)
+        if format is None:
+            raise CommandError('Pass --format to read from standard input.')
+        if options['batch_size'] < 1 or options['transaction_size'] < 1:
+            raise CommandError('Batch sizes must be positive.')
+
+        self.batch_size = options['batch_size']
+        self.statuses = dict(Status.objects.values_list('name', 'pk'))
+        self.labels = dict(Label.objects.values_list('name', 'pk'))
+        self.users = dict(User.objects.values_list('username', 'pk'))
+        self.default_author = None
+        if options['author']:
+            if options['author'] not in self.users:
+                raise CommandError(f"Unknown user {options['author']!r}.")
+            self.default_author = self.users[options['author']]
+
+        if path == '-':
+            stream = io.TextIOWrapper(
+                sys.stdin.buffer, encoding='utf-8', newline=''
+            )
+        else:
+            try:
+                stream = open(path, encoding='utf-8', newline='')
+            except OSError as error:
+                raise CommandError(error) from error
+
+        with stream:
+            rows = enumerate(read_rows(stream, format), start=1)
+            self.import_rows(rows, options['transaction_size'])
+
+    def import_rows(self, rows, transaction_size):
+        started = time.perf_counter()
+        imported = 0
+        while True:
+            try:
+                with transaction.atomic():
+                    count = self.import_chunk(islice(rows, transaction_size))
+            except (CommandError, FormatError) as error:
+                raise CommandError(
+                    f'{error} ({imported} tasks were imported before it)'
+                ) from error
+            if not count:
+                break
+            imported += count
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{imported} tasks, {imported / elapsed:.0f} rows/s, '
+                f'peak memory {peak_memory()}'
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} tasks in {elapsed:.1f}s '
+            f'({imported / elapsed if elapsed else 0:.0f} rows/s, '
+            f'peak memory {peak_memory()})'
+        ))
+
+    def import_chunk(self, rows):
+        """Insert the rows batch by batch and move the counters once."""
+        task_deltas = {field: Counter() for field in counters.TASK_COUNTERS}
+        label_deltas = Counter()
+        count = 0
+        while batch := list(islice(rows, self.batch_size)):
+            tasks, labels = zip(*(self.build(*row) for row in batch))
+            Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+            Task.labels.through.objects.bulk_create(
+                (
+                    Task.labels.through(task_id=task.pk, label_id=label_id)
+                    for task, label_ids in zip(tasks, labels)
+                    for label_id in label_ids
+                ),
+                batch_size=self.batch_size,
+            )
+
+            values = [
+                {
+                    'status': task.status_id,
+                    'author': task.author_id,
+                    'executor': task.executor_id,
+                }
+                for task in tasks
+            ]
+            for field, deltas in counters.task_deltas(values).items():
+                task_deltas[field].update(deltas)
+            for label_ids in labels:
+                label_deltas.update(label_ids)
+            count += len(batch)
+
+        counters.apply_task_deltas(task_deltas)
+        counters.adjust_labels(label_deltas)
+        return count
+
+    def build(self, number, row):
+        name = (row.get('name') or '').strip()
+        if not name:
+            raise CommandError(f'row {number}: name is required')
+        if len(name) > Task._meta.get_field('name').max_length:
+            raise CommandError(f'row {number}: name is too long')
+
+        author = row.get('author')
+        task = Task(
+            name=name,
+            description=row.get('description') or '',
+            status_id=self.lookup(
+                self.statuses, row.get('status'), 'status', number
+            ),
+            author_id=(
+                self.lookup(self.users, author, 'user', number)
+                if author else self.default_author
+            ),
+            executor_id=(
+                self.lookup(self.users, row['executor'], 'user', number)
+                if row.get('executor') else None
+            ),
+        )
+        if task.author_id is None:
+            raise CommandError(
+                f'row {number}: author is required, or pass --author'
+            )
+
+        # a set, since one through row per label is allowed
+        label_ids = {
+            self.lookup(self.labels, label, 'label', number)
+            for label in row['labels']
+        }
+        return task, label_ids
+
+    @staticmethod
+    def lookup(mapping, name, kind, number):
+        try:
+            return mapping[name]
+        except KeyError:
+            raise CommandError(
+                f'row {number}: unknown {kind} {name!r}'
+            ) from None
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recount the denormalized task counters and fix any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the drifted rows, do not fix them.',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to reconcile.',
+        )
+
+    def handle(self, *args, dry_run=False, database='default', **options):
+        report = reconcile(dry_run=dry_run, using=database)
+        verb = 'drifted' if dry_run else 'fixed'
+        for model, field, drifted in report:
+            line = f'{model._meta.label}.{field}: {drifted} {verb}'
+            if drifted:
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
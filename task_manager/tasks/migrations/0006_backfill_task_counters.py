@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+COUNTERS = [
+    ('users', 'User', 'authored_tasks_count', 'Task', 'author'),
+    ('users', 'User', 'assigned_tasks_count', 'Task', 'executor'),
+    ('statuses', 'Status', 'tasks_count', 'Task', 'status'),
+    ('labels', 'Label', 'tasks_count', 'Task_labels', 'label'),
+]
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    sources = {'Task': Task, 'Task_labels': Task.labels.through}
+
+    for app_label, model_name, field, source, column in COUNTERS:
+        counted = (
+            sources[source].objects
+            .filter(**{column: OuterRef('pk')})
+            .order_by()
+            .values(column)
+            .annotate(count=Count('*'))
+            .values('count')
+        )
+        apps.get_model(app_label, model_name).objects.update(
+            **{field: Coalesce(Subquery(counted), Value(0))}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_search'),
+        ('labels', '0003_label_tasks_count'),
+        ('statuses', '0003_status_tasks_count'),
+        ('users', '0003_user_assigned_tasks_count_user_authored_tasks_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
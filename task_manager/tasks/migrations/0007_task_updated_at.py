@@ -0,0 +1,42 @@
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import F
+
+search = import_module('task_manager.tasks.migrations.0005_task_search')
+
+
+def restore_search_triggers(apps, schema_editor):
+    # SQLite adds the column by rebuilding tasks_task, which drops the
+    # triggers keeping tasks_task_fts in sync.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in search.SQLITE_BACKWARD[:3] + search.SQLITE_FORWARD[1:4]:
+        schema_editor.execute(sql)
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_backfill_task_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -1,10 +1,13 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 
 from task_manager.statuses.models import Status
 
 User = get_user_model()
 
+# Foreign keys with a denormalized task counter on the related row.
+COUNTED_FIELDS = ('status', 'author', 'executor')
+
 
 class Task(models.Model):
     name = models.CharField(
@@ -18,18 +21,21 @@ class Task(models.Model):
     status = models.ForeignKey(
         Status,
         on_delete=models.PROTECT,
+        db_index=False,
         verbose_name='Статус'
     )
     author = models.ForeignKey(
         User,
         on_delete=models.PROTECT,
         related_name='authored_tasks',
+        db_index=False,
         verbose_name='Автор'
     )
     executor = models.ForeignKey(
         User,
         on_delete=models.PROTECT,
         related_name='assigned_tasks',
+        db_index=False,
         blank=True,
         null=True,
         verbose_name='Исполнитель'
@@ -44,11 +50,55 @@ class Task(models.Model):
         auto_now_add=True,
         verbose_name='Дата создания'
     )
+    # Also bumped when the labels change, see signals.touch_tasks.
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Задача'
         verbose_name_plural = 'Задачи'
         ordering = ['-created_at']
+        # The list is always sorted by (created_at, id) and filtered by one of
+        # these foreign keys, so each index serves both the filter and the
+        # sort; they replace the single-column foreign key indexes.
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='task_created_idx'
+            ),
+            models.Index(
+                fields=['status', '-created_at', '-id'],
+                name='task_status_created_idx'
+            ),
+            models.Index(
+                fields=['executor', '-created_at', '-id'],
+                name='task_executor_created_idx'
+            ),
+            models.Index(
+                fields=['author', '-created_at', '-id'],
+                name='task_author_created_idx'
+            ),
+        ]
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the counted foreign keys as loaded, so that the counter
+        # signals can move the counts from the old rows to the new ones.
+        instance._counted = {
+            name: instance.__dict__[f'{name}_id']
+            for name in COUNTED_FIELDS
+            if f'{name}_id' in instance.__dict__
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        # The counters are updated by post_save, so keep them in the same
+        # transaction as the row itself.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
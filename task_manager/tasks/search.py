@@ -0,0 +1,77 @@
+"""
+Full-text search over task name and description.
+
+PostgreSQL matches against a GIN-indexed ``to_tsvector`` expression and
+SQLite against the ``tasks_task_fts`` FTS5 table; both are created by the
+``0005_task_search`` migration and stay current on every write. Other
+databases fall back to ``icontains``. ``TASK_SEARCH_BACKEND`` may name a
+backend class explicitly.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+WORD = re.compile(r'\w+')
+
+
+def search_terms(query):
+    return WORD.findall(query or '')
+
+
+class IcontainsSearchBackend:
+    def filter(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset
+
+
+class SQLiteSearchBackend:
+    sql = 'SELECT rowid FROM tasks_task_fts WHERE tasks_task_fts MATCH %s'
+
+    def filter(self, queryset, terms):
+        # every term quoted so user input is never read as FTS5 syntax
+        match = ' '.join('"{}"*'.format(term) for term in terms)
+        return queryset.filter(pk__in=RawSQL(self.sql, [match]))
+
+
+class PostgresSearchBackend:
+    # Must stay identical to the indexed expression for the GIN index to
+    # be used.
+    sql = (
+        "to_tsvector('simple', coalesce(\"tasks_task\".\"name\", '') "
+        "|| ' ' || coalesce(\"tasks_task\".\"description\", '')) "
+        "@@ to_tsquery('simple', %s)"
+    )
+
+    def filter(self, queryset, terms):
+        query = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            RawSQL(self.sql, [query], output_field=BooleanField())
+        )
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(using='default'):
+    path = getattr(settings, 'TASK_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    vendor = connections[using].vendor
+    return BACKENDS.get(vendor, IcontainsSearchBackend)()
+
+
+def search_tasks(queryset, query):
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    return get_search_backend(queryset.db).filter(queryset, terms)
@@ -0,0 +1,155 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from task_manager import versioning
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+
+from . import counters
+from .choices import invalidate_choices
+from .models import COUNTED_FIELDS, Task
+
+User = get_user_model()
+
+
+# Pages and API responses are validated against the updated_at of the rows
+# they show; the cached choice lists and the anonymous user list follow a
+# version stamp (see task_manager.versioning).
+@receiver([post_save, post_delete], sender=Status)
+def status_changed(sender, **kwargs):
+    invalidate_choices('statuses')
+
+
+@receiver([post_save, post_delete], sender=Label)
+def label_changed(sender, **kwargs):
+    invalidate_choices('labels')
+
+
+@receiver(pre_delete, sender=Label)
+def label_deleting(sender, instance, using, **kwargs):
+    # Its rows in the labels table go without m2m_changed, so the tasks
+    # that carried it are touched here.
+    Task._base_manager.using(using).filter(labels=instance).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, update_fields=None, **kwargs):
+    # every login saves last_login, which no page shows
+    if update_fields == {'last_login'}:
+        return
+    versioning.invalidate('users')
+
+
+def counted_values(task):
+    return {name: task.__dict__.get(f'{name}_id') for name in COUNTED_FIELDS}
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, update_fields, using, **kwargs):
+    current = counted_values(instance)
+    if created:
+        counters.apply_task_deltas(counters.task_deltas([current]), using)
+        instance._counted = current
+        return
+
+    previous = getattr(instance, '_counted', None)
+    if previous is None:
+        # Without the loaded values there is nothing to diff against;
+        # reconcile_task_counters repairs such saves.
+        return
+
+    changed = [
+        name for name in COUNTED_FIELDS
+        if name in previous
+        and previous[name] != current[name]
+        and (update_fields is None or {name, f'{name}_id'} & update_fields)
+    ]
+    if not changed:
+        return
+
+    deltas = counters.task_deltas([{name: current[name] for name in changed}])
+    removed = counters.task_deltas(
+        [{name: previous[name] for name in changed}], sign=-1
+    )
+    for name, counter in removed.items():
+        deltas[name].update(counter)
+    counters.apply_task_deltas(deltas, using)
+    instance._counted = {**previous, **{n: current[n] for n in changed}}
+
+
+@receiver(pre_delete, sender=Task)
+def task_deleting(sender, instance, using, **kwargs):
+    # The label rows are removed without signals, so count them while they
+    # still exist.
+    label_ids = Task.labels.through._base_manager.using(using).filter(
+        task_id=instance.pk
+    ).values_list('label_id', flat=True)
+    counters.adjust_labels(Counter({pk: -1 for pk in label_ids}), using)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, using, **kwargs):
+    values = getattr(instance, '_counted', None) or counted_values(instance)
+    counters.apply_task_deltas(counters.task_deltas([values], sign=-1), using)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def task_labels_changed(sender, instance, action, reverse, pk_set, using,
+                        **kwargs):
+    through = sender._base_manager.using(using)
+    if reverse:
+        own, other = 'label_id', 'task_id'
+    else:
+        own, other = 'task_id', 'label_id'
+
+    if action == 'post_add':
+        rows = [{own: instance.pk, other: pk} for pk in pk_set]
+        sign = 1
+    elif action == 'pre_remove':
+        # pk_set holds every requested id, attached or not.
+        rows = through.filter(
+            **{own: instance.pk, f'{other}__in': pk_set}
+        ).values('label_id')
+        sign = -1
+    elif action == 'pre_clear':
+        rows = through.filter(**{own: instance.pk}).values('label_id')
+        sign = -1
+    else:
+        return
+
+    deltas = Counter()
+    for row in rows:
+        deltas[row['label_id']] += sign
+    counters.adjust_labels(deltas, using)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def touch_tasks(sender, instance, action, reverse, pk_set, using, **kwargs):
+    """A label change is a change of the task, so bump its updated_at."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if action != 'pre_clear' and not pk_set:
+        return
+
+    if not reverse:
+        tasks = Task._base_manager.filter(pk=instance.pk)
+    elif action == 'pre_clear':
+        tasks = Task._base_manager.filter(labels=instance)
+    else:
+        tasks = Task._base_manager.filter(pk__in=pk_set)
+
+    now = timezone.now()
+    tasks.using(using).update(updated_at=now)
+    if not reverse:
+        instance.updated_at = now
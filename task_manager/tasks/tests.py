@@ -1,6 +1,22 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO, TextIOWrapper
+from unittest import mock
+
+import pytest
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
@@ -9,10 +25,11 @@ from .models import Task
 
 User = get_user_model()
 
+# every request made by these tests is checked for N+1 queries
+pytestmark = pytest.mark.usefixtures('n_plus_one_guard')
 
-class TaskCRUDTests(TestCase):
-    fixtures = ['users.json', 'statuses.json', 'labels.json']
 
+class TaskCRUDTests(TestCase):
     def setUp(self):
         self.user1 = User.objects.get(pk=1)
         self.user2 = User.objects.get(pk=2)
@@ -270,4 +287,785 @@ class TaskCRUDTests(TestCase):
         
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Test Task 1')
-        self.assertContains(response, 'Test Task 2')
\ No newline at end of file
+        self.assertContains(response, 'Test Task 2')
+
+
+class TaskListQueryBudgetTests(TestCase):
+    """The task list must cost a fixed number of queries per page."""
+
+    # session, user, count and page rows; choice lists come from the cache
+    QUERY_BUDGET = 4
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status = Status.objects.get(pk=1)
+        self.label = Label.objects.get(pk=1)
+        self.client.force_login(self.user1)
+        # warm the choice list cache
+        self.client.get(reverse('tasks_index'))
+
+    def create_tasks(self, count):
+        for number in range(count):
+            task = Task.objects.create(
+                name=f'Budget Task {number}',
+                status=self.status,
+                author=self.user1,
+                executor=self.user2
+            )
+            task.labels.add(self.label)
+
+    def count_page_queries(self, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('tasks_index'), params)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        """Test that a full page costs as many queries as a single row"""
+        self.create_tasks(1)
+        single_row = self.count_page_queries()
+
+        self.create_tasks(30)
+        full_page = self.count_page_queries()
+        second_page = self.count_page_queries({'page': 2})
+
+        self.assertEqual(single_row, full_page)
+        self.assertEqual(full_page, second_page)
+        self.assertLessEqual(full_page, self.QUERY_BUDGET)
+
+    def test_query_budget_with_filters(self):
+        """Test that filtering keeps the list within the query budget"""
+        self.create_tasks(25)
+
+        queries = self.count_page_queries({
+            'status': self.status.pk,
+            'executor': self.user2.pk,
+            'labels': self.label.pk,
+            'self_tasks': 'on',
+        })
+
+        # plus one lookup per validated filter value and one per selected
+        # executor/label option, which the pickers render by themselves
+        self.assertLessEqual(queries, self.QUERY_BUDGET + 5)
+
+
+@override_settings(TASKS_PAGINATION='keyset')
+class TaskKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status1 = Status.objects.get(pk=1)
+        self.status2 = Status.objects.get(pk=2)
+        self.client.force_login(self.user1)
+
+        self.tasks = [
+            Task.objects.create(
+                name=f'Keyset Task {number}',
+                status=self.status1 if number % 2 else self.status2,
+                author=self.user1 if number % 3 else self.user2,
+            )
+            for number in range(45)
+        ]
+
+    def walk_forward(self, params=None):
+        params = dict(params or {})
+        pages = []
+        while True:
+            response = self.client.get(reverse('tasks_index'), params)
+            self.assertEqual(response.status_code, 200)
+            page = response.context['page_obj']
+            pages.append(page)
+            if not page.has_next():
+                return pages
+            params['cursor'] = page.next_cursor
+
+    def test_pages_cover_every_task_once_in_order(self):
+        """Test that following next cursors visits each task exactly once"""
+        pages = self.walk_forward()
+        seen = [task.pk for page in pages for task in page.object_list]
+
+        expected = list(
+            Task.objects.order_by('-created_at', '-id')
+            .values_list('pk', flat=True)
+        )
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual(seen, expected)
+        self.assertFalse(pages[0].has_previous())
+
+    def test_previous_cursor_returns_to_previous_page(self):
+        """Test that the previous cursor goes back to the same rows"""
+        pages = self.walk_forward()
+
+        response = self.client.get(
+            reverse('tasks_index'),
+            {'cursor': pages[2].previous_cursor}
+        )
+        page = response.context['page_obj']
+
+        self.assertEqual(
+            [task.pk for task in page],
+            [task.pk for task in pages[1]]
+        )
+        self.assertTrue(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_keyset_pages_respect_filters(self):
+        """Test that cursor pages combine with TaskFilter and self_tasks"""
+        params = {'status': self.status1.pk, 'self_tasks': 'on'}
+        pages = self.walk_forward(params)
+        seen = {task.pk for page in pages for task in page.object_list}
+
+        expected = {
+            task.pk for task in self.tasks
+            if task.status == self.status1 and task.author == self.user1
+        }
+        self.assertEqual(seen, expected)
+
+    def test_keyset_page_does_not_count_rows(self):
+        """Test that a cursor page skips the COUNT(*) over the filtered set"""
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('tasks_index'))
+
+        self.assertFalse(any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ))
+
+    def test_invalid_cursor_returns_404(self):
+        """Test that a tampered cursor is rejected"""
+        response = self.client.get(
+            reverse('tasks_index'), {'cursor': 'not-a-cursor'}
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskChoicesCacheTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.client.force_login(self.user1)
+
+    def capture(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_choices_are_not_queried_on_every_render(self):
+        """Test that warm form and filter renders skip the choice queries"""
+        for url in (reverse('task_create'), reverse('tasks_index')):
+            self.capture(url)
+            _, queries = self.capture(url)
+
+            self.assertFalse(any('"statuses_status"' in q for q in queries))
+            self.assertFalse(any('"labels_label"' in q for q in queries))
+            # not even the authenticated user, which is cached
+            self.assertFalse(any('FROM "users_user"' in q for q in queries))
+
+    def test_create_form_and_filter_share_choices(self):
+        """Test that the filter reuses choices cached by the task form"""
+        self.capture(reverse('task_create'))
+        _, queries = self.capture(reverse('tasks_index'))
+
+        self.assertFalse(any('"statuses_status"' in q for q in queries))
+
+    def test_saved_status_invalidates_choices(self):
+        """Test that a new status shows up in the cached choices"""
+        self.capture(reverse('task_create'))
+        Status.objects.create(name='Freshly Added')
+
+        response, _ = self.capture(reverse('task_create'))
+
+        self.assertContains(response, 'Freshly Added')
+
+    def test_deleted_label_invalidates_choices(self):
+        """Test that a deleted label disappears from the cached choices"""
+        url = reverse('autocomplete', kwargs={'source': 'labels'})
+        label = Label.objects.create(name='Short Lived')
+        self.assertContains(self.client.get(url), 'Short Lived')
+
+        label.delete()
+
+        self.assertNotContains(self.client.get(url), 'Short Lived')
+
+    def test_choices_expire_without_a_shared_stamp(self):
+        """Test that choices are reloaded after CHOICES_CACHE_TIMEOUT"""
+        self.capture(reverse('task_create'))
+        # update() sends no signals, like a write handled by another worker
+        Status.objects.filter(pk=1).update(name='Renamed Elsewhere')
+        response, _ = self.capture(reverse('task_create'))
+        self.assertNotContains(response, 'Renamed Elsewhere')
+
+        later = time.monotonic() + settings.CHOICES_CACHE_TIMEOUT + 1
+        with mock.patch('task_manager.versioning.time.monotonic',
+                        return_value=later):
+            response, _ = self.capture(reverse('task_create'))
+        self.assertContains(response, 'Renamed Elsewhere')
+
+
+class TaskSearchTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.status1 = Status.objects.get(pk=1)
+        self.status2 = Status.objects.get(pk=2)
+        self.client.force_login(self.user1)
+
+        self.deploy = Task.objects.create(
+            name='Настроить деплой',
+            description='Автоматическая публикация на сервер',
+            status=self.status1,
+            author=self.user1
+        )
+        self.report = Task.objects.create(
+            name='Quarterly report',
+            description='Collect numbers for the deploy review',
+            status=self.status2,
+            author=self.user1
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse('tasks_index'), params)
+        self.assertEqual(response.status_code, 200)
+        return {task.pk for task in response.context['tasks']}
+
+    def test_search_by_name(self):
+        """Test that a word of the task name finds the task"""
+        self.assertEqual(self.search(q='quarterly'), {self.report.pk})
+
+    def test_search_by_description(self):
+        """Test that a word of the description finds the task"""
+        self.assertEqual(self.search(q='публикация'), {self.deploy.pk})
+
+    def test_search_matches_word_prefixes_of_all_terms(self):
+        """Test that every term must match, as a word prefix"""
+        self.assertEqual(
+            self.search(q='deploy'), {self.report.pk}
+        )
+        self.assertEqual(self.search(q='Настр депл'), {self.deploy.pk})
+        self.assertEqual(self.search(q='Настр report'), set())
+
+    def test_search_ignores_query_syntax(self):
+        """Test that operators in the query are treated as plain text"""
+        self.assertEqual(self.search(q='("report*" -:'), {self.report.pk})
+        self.assertEqual(
+            self.search(q='***'), {self.deploy.pk, self.report.pk}
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that edits and deletions are reflected in the results"""
+        self.report.name = 'Annual summary'
+        self.report.save()
+
+        self.assertEqual(self.search(q='quarterly'), set())
+        self.assertEqual(self.search(q='annual'), {self.report.pk})
+
+        self.report.delete()
+        self.assertEqual(self.search(q='annual'), set())
+
+    def test_search_combines_with_filters(self):
+        """Test that search and the status filter narrow each other"""
+        self.assertEqual(
+            self.search(q='deploy', status=self.status2.pk), {self.report.pk}
+        )
+        self.assertEqual(
+            self.search(q='deploy', status=self.status1.pk), set()
+        )
+
+    @override_settings(
+        TASK_SEARCH_BACKEND='task_manager.tasks.search.IcontainsSearchBackend'
+    )
+    def test_fallback_backend(self):
+        """Test that the icontains backend answers the same queries"""
+        self.assertEqual(self.search(q='quarterly'), {self.report.pk})
+        self.assertEqual(self.search(q='Настр депл'), {self.deploy.pk})
+
+
+class TaskCounterTests(TestCase):
+    """The denormalized task counters follow every task change."""
+
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status1 = Status.objects.get(pk=1)
+        self.status2 = Status.objects.get(pk=2)
+        self.label1 = Label.objects.get(pk=1)
+        self.label2 = Label.objects.get(pk=2)
+        self.task = Task.objects.create(
+            name='Counted task',
+            status=self.status1,
+            author=self.user1,
+            executor=self.user2
+        )
+        self.task.labels.add(self.label1)
+
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        for field, value in expected.items():
+            self.assertEqual(getattr(obj, field), value, field)
+
+    def test_create_counts_foreign_keys_and_labels(self):
+        """Test that a new task bumps its author, executor, status, label"""
+        self.assertCounts(
+            self.user1, authored_tasks_count=1, assigned_tasks_count=0
+        )
+        self.assertCounts(
+            self.user2, authored_tasks_count=0, assigned_tasks_count=1
+        )
+        self.assertCounts(self.status1, tasks_count=1)
+        self.assertCounts(self.label1, tasks_count=1)
+
+    def test_update_moves_counts(self):
+        """Test that changing the foreign keys moves the counts"""
+        task = Task.objects.get(pk=self.task.pk)
+        task.status = self.status2
+        task.executor = None
+        task.save()
+
+        self.assertCounts(self.status1, tasks_count=0)
+        self.assertCounts(self.status2, tasks_count=1)
+        self.assertCounts(self.user2, assigned_tasks_count=0)
+
+        task.executor = self.user1
+        task.save(update_fields=['executor'])
+        self.assertCounts(self.user1, assigned_tasks_count=1)
+
+    def test_update_through_view(self):
+        """Test that editing a task in the form moves the counts"""
+        self.client.force_login(self.user1)
+        self.client.post(reverse('task_update', args=[self.task.pk]), {
+            'name': 'Counted task',
+            'status': self.status2.pk,
+            'executor': self.user1.pk,
+            'labels': [self.label2.pk],
+        })
+
+        self.assertCounts(self.status1, tasks_count=0)
+        self.assertCounts(self.status2, tasks_count=1)
+        self.assertCounts(self.user1, assigned_tasks_count=1)
+        self.assertCounts(self.user2, assigned_tasks_count=0)
+        self.assertCounts(self.label1, tasks_count=0)
+        self.assertCounts(self.label2, tasks_count=1)
+
+    def test_delete_releases_counts(self):
+        """Test that deleting a task decrements every counter"""
+        Task.objects.get(pk=self.task.pk).delete()
+
+        self.assertCounts(self.user1, authored_tasks_count=0)
+        self.assertCounts(self.user2, assigned_tasks_count=0)
+        self.assertCounts(self.status1, tasks_count=0)
+        self.assertCounts(self.label1, tasks_count=0)
+
+    def test_label_changes(self):
+        """Test that add, remove, clear and the reverse side are counted"""
+        self.task.labels.add(self.label1, self.label2)
+        self.assertCounts(self.label1, tasks_count=1)
+        self.assertCounts(self.label2, tasks_count=1)
+
+        self.task.labels.remove(self.label2, self.label2)
+        self.task.labels.remove(self.label2)
+        self.assertCounts(self.label2, tasks_count=0)
+
+        self.label2.tasks.add(self.task)
+        self.assertCounts(self.label2, tasks_count=1)
+        self.label2.tasks.clear()
+        self.assertCounts(self.label2, tasks_count=0)
+
+        self.task.labels.clear()
+        self.assertCounts(self.label1, tasks_count=0)
+
+    def test_saving_related_rows_keeps_counts(self):
+        """Test that a stale instance does not overwrite its counters"""
+        stale = Status.objects.get(pk=self.status1.pk)
+        Task.objects.create(
+            name='Another task', status=self.status1, author=self.user1
+        )
+        stale.name = 'Renamed'
+        stale.save()
+
+        self.assertCounts(self.status1, tasks_count=2, name='Renamed')
+
+    def test_saving_deferred_or_new_rows(self):
+        """Test that deferred fields stay unloaded and new rows insert"""
+        partial = Status.objects.only('name').get(pk=self.status1.pk)
+        partial.name = 'Partial'
+        with CaptureQueriesContext(connection) as context:
+            partial.save()
+        self.assertEqual(len(context), 1)
+        self.assertCounts(self.status1, tasks_count=1, name='Partial')
+
+        status = Status(pk=100, name='Explicit pk')
+        status.save()
+        self.assertCounts(status, tasks_count=0, name='Explicit pk')
+
+    def test_reconcile_command(self):
+        """Test that the command reports and fixes drifted counters"""
+        Status.objects.filter(pk=self.status1.pk).update(tasks_count=7)
+        Label.objects.update(tasks_count=3)
+
+        out = StringIO()
+        call_command('reconcile_task_counters', '--dry-run', stdout=out)
+        self.assertIn('statuses.Status.tasks_count: 1 drifted', out.getvalue())
+        self.assertCounts(self.status1, tasks_count=7)
+
+        out = StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+        self.assertIn('labels.Label.tasks_count: 4 fixed', out.getvalue())
+        self.assertCounts(self.status1, tasks_count=1)
+        self.assertCounts(self.label1, tasks_count=1)
+        self.assertCounts(self.label2, tasks_count=0)
+
+    def test_index_pages_show_counts_without_extra_queries(self):
+        """Test that the index pages read the counters, not COUNT(*)"""
+        self.client.force_login(self.user1)
+        for name in ('users_index', 'statuses_index', 'labels_index'):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(any(
+                'COUNT(' in query['sql'].upper()
+                for query in context.captured_queries
+            ), name)
+
+        response = self.client.get(reverse('statuses_index'))
+        self.assertContains(response, '<td class="col-1">1</td>', html=True)
+
+
+class TaskImportTests(TestCase):
+    def import_tasks(self, content, suffix='.csv', *args):
+        with tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, encoding='utf-8', delete=False
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.unlink, file.name)
+        out = StringIO()
+        call_command('import_tasks', file.name, *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_csv(self):
+        """Test that CSV rows become tasks with resolved relations"""
+        out = self.import_tasks(
+            'name,description,status,author,executor,labels\n'
+            'Imported 1,First,New,user1,user2,"bug, feature"\n'
+            'Imported 2,,Done,user2,,\n',
+            '.csv', '--batch-size', '1',
+        )
+
+        self.assertIn('Imported 2 tasks', out)
+        self.assertIn('rows/s', out)
+        first = Task.objects.get(name='Imported 1')
+        self.assertEqual(first.status.name, 'New')
+        self.assertEqual(first.executor.username, 'user2')
+        self.assertEqual(
+            set(first.labels.values_list('name', flat=True)),
+            {'bug', 'feature'}
+        )
+        second = Task.objects.get(name='Imported 2')
+        self.assertIsNone(second.executor)
+        self.assertFalse(second.labels.exists())
+
+    def test_import_jsonl_updates_counters(self):
+        """Test that JSON Lines import keeps the task counters exact"""
+        self.import_tasks(
+            '{"name": "A", "status": "New", "labels": ["bug"]}\n'
+            '\n'
+            '{"name": "B", "status": "New", "labels": ["bug", "bug"]}\n',
+            '.jsonl', '--author', 'user1', '--transaction-size', '1',
+        )
+
+        self.assertEqual(Status.objects.get(name='New').tasks_count, 2)
+        self.assertEqual(Label.objects.get(name='bug').tasks_count, 2)
+        self.assertEqual(
+            User.objects.get(username='user1').authored_tasks_count, 2
+        )
+
+    def test_import_from_stdin(self):
+        """Test that rows can be piped in on standard input"""
+        stdin = TextIOWrapper(
+            BytesIO('{"name": "Piped", "status": "New"}\n'.encode())
+        )
+        with mock.patch('sys.stdin', stdin):
+            call_command(
+                'import_tasks', '--format', 'jsonl', '--author', 'user1',
+                stdout=StringIO(),
+            )
+
+        self.assertTrue(Task.objects.filter(name='Piped').exists())
+
+    def test_jsonl_field_types_are_checked(self):
+        """Test that a non-string value is reported with its line number"""
+        with self.assertRaisesMessage(
+            CommandError, 'line 2: name must be a string'
+        ):
+            self.import_tasks(
+                '{"name": "A", "status": "New"}\n'
+                '{"name": 42, "status": "New"}\n',
+                '.jsonl', '--author', 'user1',
+            )
+
+        for labels in ('[1]', '{"bug": 1}'):
+            with self.assertRaisesMessage(
+                CommandError,
+                'line 1: labels must be a string or a list of strings',
+            ):
+                self.import_tasks(
+                    f'{{"name": "A", "status": "New", "labels": {labels}}}\n',
+                    '.jsonl', '--author', 'user1',
+                )
+        self.assertFalse(Task.objects.filter(name='A').exists())
+
+    def test_memory_report_is_optional(self):
+        """Test that the import runs where the resource module is missing"""
+        with mock.patch.dict(sys.modules, {'resource': None}):
+            out = self.import_tasks(
+                '{"name": "Anywhere", "status": "New"}\n',
+                '.jsonl', '--author', 'user1',
+            )
+
+        self.assertIn('peak memory n/a', out)
+        self.assertTrue(Task.objects.filter(name='Anywhere').exists())
+
+    def test_unknown_name_rolls_back_the_chunk(self):
+        """Test that a bad row aborts only its own transaction"""
+        with self.assertRaisesMessage(CommandError, "unknown status 'Nope'"):
+            self.import_tasks(
+                'name,status,author\n'
+                'Kept,New,user1\n'
+                'Lost,New,user1\n'
+                'Broken,Nope,user1\n',
+                '.csv', '--transaction-size', '2',
+            )
+
+        self.assertTrue(Task.objects.filter(name='Kept').exists())
+        self.assertFalse(Task.objects.filter(name='Broken').exists())
+        self.assertEqual(Status.objects.get(name='New').tasks_count, 2)
+
+
+class TaskExportTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status1 = Status.objects.get(pk=1)
+        self.status2 = Status.objects.get(pk=2)
+        self.label = Label.objects.get(pk=1)
+        self.mine = Task.objects.create(
+            name='Mine', status=self.status1, author=self.user1,
+            executor=self.user2
+        )
+        self.mine.labels.add(self.label, Label.objects.get(pk=2))
+        self.theirs = Task.objects.create(
+            name='Theirs', status=self.status2, author=self.user2
+        )
+        self.client.force_login(self.user1)
+
+    def export(self, **params):
+        response = self.client.get(reverse('tasks_export'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_requires_login(self):
+        """Test that anonymous users are sent to the login page"""
+        self.client.logout()
+        response = self.client.get(reverse('tasks_export'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_csv_export(self):
+        """Test that the CSV export holds every task with related names"""
+        rows = list(csv.DictReader(StringIO(self.export(format='csv'))))
+
+        self.assertEqual([row['name'] for row in rows], ['Theirs', 'Mine'])
+        mine = rows[1]
+        self.assertEqual(mine['status'], self.status1.name)
+        self.assertEqual(mine['author'], 'user1')
+        self.assertEqual(mine['executor'], 'user2')
+        self.assertEqual(set(mine['labels'].split(',')), {'bug', 'feature'})
+
+    def test_jsonl_export_applies_filters(self):
+        """Test that the export honours the task list filters"""
+        lines = self.export(format='jsonl', self_tasks='on').splitlines()
+        self.assertEqual([json.loads(line)['name'] for line in lines], ['Mine'])
+
+        lines = self.export(format='jsonl', status=self.status2.pk)
+        self.assertEqual(
+            [json.loads(line)['name'] for line in lines.splitlines()],
+            ['Theirs']
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test that related names are joined rather than queried per row"""
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                self.export(format='jsonl')
+            return len(context.captured_queries)
+
+        # the first request also caches the signed-in user
+        count_queries()
+        before = count_queries()
+        for number in range(10):
+            task = Task.objects.create(
+                name=f'Extra {number}', status=self.status1,
+                author=self.user2, executor=self.user1
+            )
+            task.labels.add(self.label)
+        self.assertEqual(count_queries(), before)
+
+    def test_unknown_format(self):
+        """Test that an unsupported format is a 404"""
+        response = self.client.get(reverse('tasks_export'), {'format': 'xml'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_round_trips_through_import(self):
+        """Test that an export can be imported back"""
+        content = self.export(format='csv')
+        Task.objects.all().delete()
+        with tempfile.NamedTemporaryFile(
+            'w', suffix='.csv', encoding='utf-8', delete=False
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.unlink, file.name)
+
+        call_command('import_tasks', file.name, stdout=StringIO())
+        self.assertEqual(
+            set(Task.objects.values_list('name', flat=True)),
+            {'Mine', 'Theirs'}
+        )
+
+
+class TaskDetailConditionalTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.get(pk=1)
+        self.status = Status.objects.get(pk=1)
+        self.label = Label.objects.get(pk=1)
+        self.task = Task.objects.create(
+            name='Shown', status=self.status, author=self.user,
+            executor=User.objects.get(pk=2)
+        )
+        self.task.labels.add(self.label, Label.objects.get(pk=2))
+        self.url = reverse('task_show', args=[self.task.pk])
+        self.client.force_login(self.user)
+
+    def get(self, **headers):
+        return self.client.get(self.url, headers=headers)
+
+    def test_detail_queries(self):
+        """Test that the page is one joined query plus one for labels"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.get()
+
+        self.assertContains(response, 'bug')
+        self.assertContains(response, 'feature')
+        # session, user, timestamps, task with relations, labels
+        self.assertEqual(len(context.captured_queries), 5)
+
+    def test_not_modified(self):
+        """Test that a matching ETag gets a 304 without loading the task"""
+        response = self.get()
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(If_None_Match=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        # session and the timestamps; the user is cached
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_label_changes_bump_updated_at(self):
+        """Test that adding or removing labels changes the task"""
+        before = Task.objects.get(pk=self.task.pk).updated_at
+        etag = self.get()['ETag']
+
+        self.label.tasks.remove(self.task)
+        self.assertGreater(
+            Task.objects.get(pk=self.task.pk).updated_at, before
+        )
+        response = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, '<li>bug</li>', html=True)
+
+    def test_related_rename_changes_etag(self):
+        """Test that renaming the status invalidates the page"""
+        etag = self.get()['ETag']
+        self.status.name = 'Renamed status'
+        self.status.save()
+
+        response = self.get(If_None_Match=etag)
+        self.assertContains(response, 'Renamed status')
+
+    def test_unsignalled_changes_expire_the_page(self):
+        """Test that writes this process never heard of change the tags"""
+        response = self.get()
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        # update() sends no signals, like a write handled by another worker
+        later = timezone.now() + timedelta(seconds=5)
+        Label.objects.filter(pk=self.label.pk).update(
+            name='relabelled', updated_at=later
+        )
+        response = self.get(If_None_Match=etag)
+        self.assertContains(response, 'relabelled')
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
+        etag = response['ETag']
+        User.objects.filter(pk=2).update(
+            first_name='Renamed', updated_at=later + timedelta(seconds=5)
+        )
+        response = self.get(If_None_Match=etag)
+        self.assertContains(response, 'Renamed')
+
+    def test_missing_task(self):
+        """Test that an unknown task is still a 404"""
+        response = self.client.get(reverse('task_show', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskRowCacheTests(TestCase):
+    def setUp(self):
+        self.user1 = User.objects.get(pk=1)
+        self.user2 = User.objects.get(pk=2)
+        self.status = Status.objects.get(pk=1)
+        self.task = Task.objects.create(
+            name='Cached row', status=self.status, author=self.user1,
+            executor=self.user2
+        )
+        self.client.force_login(self.user1)
+        self.client.get(reverse('tasks_index'))
+
+    def page(self):
+        return self.client.get(reverse('tasks_index'))
+
+    def test_rows_are_served_from_the_cache(self):
+        """Test that an unchanged task row is not rendered again"""
+        # update() bypasses updated_at and the signals
+        Task.objects.filter(pk=self.task.pk).update(name='Sneaky')
+        self.assertContains(self.page(), 'Cached row')
+        self.assertNotContains(self.page(), 'Sneaky')
+
+    def test_task_change_renders_the_row(self):
+        """Test that saving the task replaces its cached row"""
+        self.task.name = 'Renamed row'
+        self.task.save()
+        self.assertContains(self.page(), 'Renamed row')
+
+    def test_related_changes_render_the_row(self):
+        """Test that status and user renames reach the cached rows"""
+        self.status.name = 'Other status'
+        self.status.save()
+        self.user2.first_name = 'Renamed'
+        self.user2.save()
+
+        response = self.page()
+        self.assertContains(response, 'Other status')
+        self.assertContains(response, 'Renamed')
+
+    def test_unsignalled_related_change_renders_the_row(self):
+        """Test that a rename this process never heard of reaches the row"""
+        # update() sends no signals, like a write handled by another worker
+        Status.objects.filter(pk=self.status.pk).update(
+            name='Elsewhere', updated_at=timezone.now()
+        )
+        self.assertContains(self.page(), 'Elsewhere')
+
+    def test_login_keeps_the_rows(self):
+        """Test that saving last_login on login does not expire the rows"""
+        Task.objects.filter(pk=self.task.pk).update(name='Sneaky')
+        self.client.force_login(self.user1)
+        self.assertNotContains(self.page(), 'Sneaky')
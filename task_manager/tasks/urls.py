@@ -4,6 +4,7 @@ from . import views
 
 urlpatterns = [
     path('', views.TasksIndexView.as_view(), name='tasks_index'),
+    path('export/', views.TasksExportView.as_view(), name='tasks_export'),
     path('create/', views.TaskCreateView.as_view(), name='task_create'),
     path('<int:pk>/', views.TaskDetailView.as_view(), name='task_show'),
     path(
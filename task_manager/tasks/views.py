@@ -1,13 +1,26 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.messages import get_messages
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db.models import Max, Prefetch
+from django.http import Http404, StreamingHttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
+from django.views.decorators.http import condition
 from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
 from django_filters.views import FilterView
 
+from task_manager.labels.models import Label
+from task_manager.pagination import InvalidCursor, KeysetPaginator
+
 from .filters import TaskFilter
+from .formats import CONTENT_TYPES, FORMATS, task_record, write_rows
 from .forms import TaskForm
 from .models import Task
 
@@ -18,21 +31,46 @@ class TasksIndexView(LoginRequiredMixin, FilterView):
     model = Task
     template_name = 'tasks/index.html'
     context_object_name = 'tasks'
+    replica_reads = True
     filterset_class = TaskFilter
     paginate_by = 20
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        
+        # Every row renders its status, author and executor, so join them
+        # instead of issuing three extra queries per task.
+        queryset = super().get_queryset().select_related(
+            'status', 'author', 'executor'
+        )
+
         # Filter for author's own tasks if checkbox is checked
         if self.request.GET.get('self_tasks'):
             queryset = queryset.filter(author=self.request.user)
             
         return queryset
+
+    def uses_keyset_pagination(self):
+        return (
+            settings.TASKS_PAGINATION == 'keyset'
+            or 'cursor' in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы')
+        return (paginator, page, page.object_list, page.has_other_pages())
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['filter'] = self.filterset
+        # A cached row is keyed by the task id and the updated_at of the
+        # task, its status, author and executor (see tasks/index.html).
+        context['row_cache_timeout'] = settings.TASK_ROW_CACHE_TIMEOUT
         return context
 
     def handle_no_permission(self):
@@ -43,10 +81,103 @@ class TasksIndexView(LoginRequiredMixin, FilterView):
         return super().handle_no_permission()
 
 
+class TasksExportView(TasksIndexView):
+    """Stream the filtered task list as CSV or JSON Lines."""
+
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        format = request.GET.get('format', 'csv')
+        if format not in FORMATS:
+            raise Http404('Неизвестный формат выгрузки')
+
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if (
+            not self.filterset.is_bound
+            or self.filterset.is_valid()
+            or not self.get_strict()
+        ):
+            queryset = self.filterset.qs
+        else:
+            queryset = self.filterset.queryset.none()
+
+        # Rows come off a server-side cursor chunk by chunk, with one label
+        # query per chunk, so memory does not grow with the export.
+        queryset = queryset.order_by('-created_at', '-id').prefetch_related(
+            Prefetch('labels', queryset=Label.objects.only('name'))
+        )
+        records = map(task_record, queryset.iterator(self.chunk_size))
+
+        response = StreamingHttpResponse(
+            write_rows(records, format), content_type=CONTENT_TYPES[format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="tasks.{format}"'
+        )
+        return response
+
+
 class TaskDetailView(LoginRequiredMixin, DetailView):
     model = Task
     template_name = 'tasks/show.html'
     context_object_name = 'task'
+    replica_reads = True
+
+    def get(self, request, *args, **kwargs):
+        # Answer conditional requests from the updated_at timestamps alone,
+        # before the task is loaded or the template rendered.
+        return condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified,
+        )(super().get)(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'status', 'author', 'executor'
+        ).prefetch_related('labels')
+
+    @cached_property
+    def changes(self):
+        """
+        When the task and each row the page shows with it last changed, in
+        one query: the task, its status, author and executor, and the most
+        recently changed of its labels.
+        """
+        return Task.objects.filter(pk=self.kwargs['pk']).annotate(
+            labels_updated_at=Max('labels__updated_at')
+        ).values_list(
+            'updated_at',
+            'status__updated_at',
+            'author__updated_at',
+            'executor__updated_at',
+            'labels_updated_at',
+        ).first()
+
+    def get_etag(self, request, *args, **kwargs):
+        # Pending messages are rendered once, so such pages are never reused.
+        if self.changes is None or get_messages(request):
+            return None
+        # The page also shows the current user and a CSRF token, so both are
+        # part of the tag.
+        key = '|'.join(str(part) for part in (
+            self.kwargs['pk'],
+            *(value and value.isoformat() for value in self.changes),
+            request.user.pk,
+            self.csrf_secret(request),
+        ))
+        return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+    @staticmethod
+    def csrf_secret(request):
+        # get_token() creates the secret when the request has none yet, so
+        # the tag matches the token the page is about to render.
+        get_token(request)
+        return request.META['CSRF_COOKIE']
+
+    def get_last_modified(self, request, *args, **kwargs):
+        if self.changes is None or get_messages(request):
+            return None
+        return max(value for value in self.changes if value)
 
     def handle_no_permission(self):
         messages.error(
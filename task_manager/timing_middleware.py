@@ -0,0 +1,83 @@
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from task_manager.metrics import registry
+
+UNRESOLVED = '<unresolved>'
+
+
+class RequestTiming:
+    """Per-request timings; also the execute wrapper counting SQL queries."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - started
+            self.queries += 1
+
+    def rendered(self, response):
+        self.render_time = perf_counter() - self.render_started
+
+
+class RequestTimingMiddleware:
+    """
+    Record wall time, SQL queries, SQL time and template render time of
+    every request in ``task_manager.metrics.registry``, keyed by the URL
+    name, and report them in a ``Server-Timing`` header.
+
+    Rendering is timed for template responses, which all the class-based
+    views return. The middleware's own cost is recorded as
+    ``timing_overhead_seconds`` and checked against
+    ``REQUEST_TIMING_BUDGET_MS`` by the tests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = settings.SERVER_TIMING_HEADER
+
+    def __call__(self, request):
+        started = perf_counter()
+        timing = request.timing = RequestTiming()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing))
+            overhead = perf_counter() - started
+            response = self.get_response(request)
+            finished = perf_counter()
+
+        wall_time = finished - started
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else UNRESOLVED
+        if self.header:
+            response['Server-Timing'] = (
+                f'app;dur={wall_time * 1000:.1f}, '
+                f'db;dur={timing.db_time * 1000:.1f};'
+                f'desc="{timing.queries} queries", '
+                f'tpl;dur={timing.render_time * 1000:.1f}'
+            )
+        registry.record(view, {
+            'request_seconds': wall_time * 1e6,
+            'db_queries': timing.queries,
+            'db_seconds': timing.db_time * 1e6,
+            'template_seconds': timing.render_time * 1e6,
+        })
+        overhead += perf_counter() - finished
+        registry.record(view, {'timing_overhead_seconds': overhead * 1e6})
+        return response
+
+    def process_template_response(self, request, response):
+        timing = request.timing
+        timing.render_started = perf_counter()
+        response.add_post_render_callback(timing.rendered)
+        return response
@@ -29,4 +29,11 @@ urlpatterns = [
     path('statuses/', include('task_manager.statuses.urls')),
     path('tasks/', include('task_manager.tasks.urls')),
     path('labels/', include('task_manager.labels.urls')),
+    path('api/', include('task_manager.api.urls')),
+    path(
+        'autocomplete/<str:source>/',
+        views.AutocompleteView.as_view(),
+        name='autocomplete'
+    ),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
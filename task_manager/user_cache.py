@@ -0,0 +1,72 @@
+"""
+Cached ``request.user``.
+
+``AuthenticationMiddleware`` loads the signed-in user from the database on
+every request. ``CachedAuthenticationMiddleware`` keeps the user object in
+the default cache for ``USER_CACHE_TIMEOUT`` seconds instead, keyed by the
+user id and the session's auth hash (derived from the password hash), so an
+entry only ever serves sessions it was verified against. A user is loaded
+and verified by ``django.contrib.auth.get_user`` as before on a miss. Async
+views get the same cached user from ``await request.auser()``.
+
+``UserUpdateView`` and ``UserDeleteView`` drop the entry with
+``forget_user``; a password changed anywhere else (the admin, the
+``changepassword`` command) stops old sessions once the entry expires.
+"""
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
+
+KEY_PREFIX = 'auth-user:'
+
+
+def get_key(user_id, session_hash):
+    return f'{KEY_PREFIX}{user_id}:{session_hash}'
+
+
+def get_user(request):
+    if hasattr(request, '_cached_user'):
+        return request._cached_user
+
+    user_id = request.session.get(auth.SESSION_KEY)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not settings.USER_CACHE_TIMEOUT or not user_id or not session_hash:
+        user = auth.get_user(request)
+    else:
+        key = get_key(user_id, session_hash)
+        user = cache.get(key)
+        if user is None:
+            user = auth.get_user(request)
+            # a session that failed verification has been flushed by now
+            if user.is_authenticated and (
+                request.session.get(auth.HASH_SESSION_KEY) == session_hash
+            ):
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    request._cached_user = user
+    return user
+
+
+async def aget_user(request):
+    return await sync_to_async(get_user)(request)
+
+
+def forget_user(user_id, *session_hashes):
+    """Drop the cached user for sessions with any of ``session_hashes``."""
+    keys = [get_key(user_id, session_hash) for session_hash in session_hashes]
+    # and once more after commit, in case a request cached the old row
+    # before the change was visible
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(aget_user, request)
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# Indexes for the case-insensitive prefix search of the user list
+# (istartswith). SQLite only uses an index for LIKE when it compares with
+# NOCASE; PostgreSQL needs the expression Django compares, UPPER(column),
+# with text_pattern_ops so LIKE 'PREFIX%' becomes a range scan.
+COLUMNS = ('username', 'first_name', 'last_name')
+
+SQLITE_FORWARD = [
+    f'CREATE INDEX users_user_{column}_prefix_idx '
+    f'ON users_user ({column} COLLATE NOCASE)'
+    for column in COLUMNS
+]
+
+POSTGRES_FORWARD = [
+    f'CREATE INDEX users_user_{column}_prefix_idx '
+    f'ON users_user (UPPER({column}::text) text_pattern_ops)'
+    for column in COLUMNS
+]
+
+BACKWARD = [
+    f'DROP INDEX IF EXISTS users_user_{column}_prefix_idx'
+    for column in COLUMNS
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_assigned_tasks_count_user_authored_tasks_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            run({'sqlite': BACKWARD, 'postgresql': BACKWARD}),
+        ),
+    ]
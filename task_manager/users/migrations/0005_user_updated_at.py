@@ -0,0 +1,39 @@
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import F
+
+indexes = import_module('task_manager.users.migrations.0004_user_search_indexes')
+
+
+def restore_search_indexes(apps, schema_editor):
+    # SQLite adds the column by rebuilding users_user, which drops the
+    # prefix search indexes.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in indexes.BACKWARD + indexes.SQLITE_FORWARD:
+        schema_editor.execute(sql)
+
+
+def backfill(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    User.objects.update(updated_at=F('date_joined'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(
+            restore_search_indexes, restore_search_indexes
+        ),
+    ]
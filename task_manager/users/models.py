@@ -1,8 +1,10 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from task_manager.models import TaskCountersMixin
 
-class User(AbstractUser):
+
+class User(TaskCountersMixin, AbstractUser):
     first_name = models.CharField(
         max_length=150,
         blank=False,
@@ -13,7 +15,22 @@ class User(AbstractUser):
         blank=False,
         verbose_name='Фамилия'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+    authored_tasks_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Создано задач'
+    )
+    assigned_tasks_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Назначено задач'
+    )
     USERNAME_FIELD = 'username'
+    counter_fields = ('authored_tasks_count', 'assigned_tasks_count')
 
     def __str__(self):
         return f'{self.first_name} {self.last_name}'
\ No newline at end of file
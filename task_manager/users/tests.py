@@ -1,14 +1,20 @@
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.users.views import UsersIndexView
+
 User = get_user_model()
 
 
 class UserCRUDTests(TestCase):
-    fixtures = ['users.json']
-
     def setUp(self):
         self.user1 = User.objects.get(pk=1)
         self.user2 = User.objects.get(pk=2)
@@ -105,4 +111,174 @@ class UserCRUDTests(TestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, 'Пользователи')
\ No newline at end of file
+        self.assertContains(response, 'Пользователи')
+
+
+@override_settings(USERS_PAGE_CACHE_TIMEOUT=60)
+class UsersIndexTests(TestCase):
+    def setUp(self):
+        self.url = reverse('users_index')
+
+    def usernames(self, response):
+        return [user.username for user in response.context['users']]
+
+    def test_prefix_search(self):
+        """?q= matches the start of the username, first or last name."""
+        response = self.client.get(self.url, {'q': 'th'})
+        self.assertEqual(self.usernames(response), ['user3'])
+
+        response = self.client.get(self.url, {'q': 'USER'})
+        self.assertEqual(
+            self.usernames(response), ['user1', 'user2', 'user3']
+        )
+
+        response = self.client.get(self.url, {'q': 'ne'})
+        self.assertEqual(self.usernames(response), [])
+
+    def test_keyset_pagination(self):
+        """Pages follow each other by cursor in username order."""
+        with patch.object(UsersIndexView, 'paginate_by', 2):
+            first = self.client.get(self.url)
+            self.assertEqual(self.usernames(first), ['user1', 'user2'])
+            page = first.context['page_obj']
+            self.assertFalse(page.has_previous())
+
+            second = self.client.get(self.url, {'cursor': page.next_cursor})
+            self.assertEqual(self.usernames(second), ['user3'])
+            self.assertFalse(second.context['page_obj'].has_next())
+
+        response = self.client.get(self.url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_loads_only_shown_columns(self):
+        """The password and other unused columns are deferred."""
+        response = self.client.get(self.url)
+        user = response.context['users'][0]
+        self.assertIn('password', user.get_deferred_fields())
+        self.assertNotIn('username', user.get_deferred_fields())
+
+    def test_anonymous_page_cached(self):
+        """A repeated anonymous request is answered from the cache."""
+        self.client.get(self.url, {'q': 'user'})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'q': 'user'})
+        self.assertContains(response, 'user1')
+
+    def test_cache_dropped_on_user_change(self):
+        """Creating, updating or deleting a user shows on the next page."""
+        self.client.get(self.url)
+        user = User.objects.create_user(
+            'newcomer', first_name='New', last_name='Comer'
+        )
+        self.assertContains(self.client.get(self.url), 'newcomer')
+
+        user.username = 'renamed'
+        user.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'renamed')
+        self.assertNotContains(response, 'newcomer')
+
+        user.delete()
+        self.assertNotContains(self.client.get(self.url), 'renamed')
+
+    def test_cache_dropped_on_reassigned_task(self):
+        """Moving a task to another executor shows the new counts."""
+        user1, user2 = User.objects.get(pk=1), User.objects.get(pk=2)
+        task = Task.objects.create(
+            name='Moved', status=Status.objects.get(pk=1),
+            author=user1, executor=user1,
+        )
+        self.assertEqual(self.assigned_counts(), {'user1': 1, 'user2': 0})
+
+        task.executor = user2
+        task.save()
+        self.assertEqual(self.assigned_counts(), {'user1': 0, 'user2': 1})
+
+    def assigned_counts(self):
+        response = self.client.get(self.url)
+        return {
+            user.username: user.assigned_tasks_count
+            for user in response.context['users']
+            if user.username in ('user1', 'user2')
+        }
+
+    def test_authenticated_page_not_cached(self):
+        """A signed-in user always gets a freshly rendered page."""
+        self.client.force_login(User.objects.get(pk=1))
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Выход')
+        self.assertGreater(len(response.context['users']), 0)
+
+
+class UserCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.get(pk=1)
+        self.user.set_password('testpass123')
+        self.user.save()
+        self.client.force_login(self.user)
+        # a second browser of the same user
+        self.other = self.client_class()
+        self.other.force_login(self.user)
+
+    def user_queries(self, client, url=None):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url or reverse('statuses_index'))
+        queries = [
+            query['sql'] for query in context
+            if 'FROM "users_user"' in query['sql']
+        ]
+        return response, queries
+
+    def test_user_row_cached_across_requests(self):
+        """The signed-in user is loaded once, then served from the cache."""
+        _, queries = self.user_queries(self.client)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.user_queries(self.client)
+        self.assertEqual(queries, [])
+        self.assertEqual(response.context['user'], self.user)
+
+        # other sessions of the same user share the entry
+        _, queries = self.user_queries(self.other)
+        self.assertEqual(queries, [])
+
+    @override_settings(USER_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        """USER_CACHE_TIMEOUT=0 loads the user on every request."""
+        self.user_queries(self.client)
+        _, queries = self.user_queries(self.client)
+        self.assertEqual(len(queries), 1)
+
+    def test_update_refreshes_cached_user(self):
+        """A profile change is visible on the next request."""
+        self.user_queries(self.other)
+        self.client.post(
+            reverse('user_update', args=[self.user.pk]),
+            {'username': 'user1', 'first_name': 'Новое', 'last_name': 'Имя'},
+        )
+        response, _ = self.user_queries(self.other)
+        self.assertEqual(response.context['user'].first_name, 'Новое')
+
+    def test_password_change_ends_other_sessions(self):
+        """Sessions with the old password hash are not served from cache."""
+        self.user_queries(self.other)
+        self.client.post(
+            reverse('user_update', args=[self.user.pk]),
+            {
+                'username': 'user1', 'first_name': 'User',
+                'last_name': 'One', 'password1': 'newpass123',
+                'password2': 'newpass123',
+            },
+        )
+        response, _ = self.user_queries(self.other)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_delete_ends_cached_sessions(self):
+        """A deleted user is not served from the cache."""
+        self.user_queries(self.other)
+        self.client.post(reverse('user_delete', args=[self.user.pk]))
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
+        response, _ = self.user_queries(self.other)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
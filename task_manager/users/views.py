@@ -1,13 +1,19 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import ProtectedError
+from django.core.cache import cache
+from django.db.models import ProtectedError, Q
+from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager import versioning
+from task_manager.pagination import InvalidCursor, KeysetPaginator
+from task_manager.user_cache import forget_user
 from task_manager.users.forms import (
     UserLoginForm,
     UserRegistrationForm,
@@ -18,9 +24,83 @@ User = get_user_model()
 
 
 class UsersIndexView(ListView):
+    """
+    The public user list: paged by cursor on (username, id) and searched by
+    a prefix of the username, first or last name, which the indexes of
+    migration 0004 serve. Pages rendered for anonymous visitors are kept in
+    the default cache for USERS_PAGE_CACHE_TIMEOUT seconds under the
+    'users' version stamp, which user saves and the task counter updates
+    bump, so a registered, changed or deleted user and moved counts show
+    up on the next request.
+    """
+
     model = User
     template_name = 'users/index.html'
     context_object_name = 'users'
+    replica_reads = True
+    paginate_by = 20
+    ordering = ('username', 'id')
+    # the columns the list shows
+    columns = (
+        'id', 'username', 'first_name', 'last_name', 'date_joined',
+        'authored_tasks_count', 'assigned_tasks_count',
+    )
+
+    def get(self, request, *args, **kwargs):
+        key = self.get_cache_key()
+        if key is None:
+            return super().get(request, *args, **kwargs)
+
+        response = cache.get(key)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            response.add_post_render_callback(
+                lambda response: cache.set(
+                    key, response, settings.USERS_PAGE_CACHE_TIMEOUT
+                )
+            )
+        return response
+
+    def get_cache_key(self):
+        # Only the page of an anonymous visitor is the same for everybody,
+        # and only as long as no message waits to be shown on it.
+        if (
+            not settings.USERS_PAGE_CACHE_TIMEOUT
+            or self.request.user.is_authenticated
+            or len(messages.get_messages(self.request))
+        ):
+            return None
+        return 'users-page:{}:{}'.format(
+            versioning.get_version('users'),
+            self.request.GET.urlencode(),
+        )
+
+    def get_search(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        queryset = User.objects.only(*self.columns)
+        search = self.get_search()
+        if search:
+            queryset = queryset.filter(
+                Q(username__istartswith=search)
+                | Q(first_name__istartswith=search)
+                | Q(last_name__istartswith=search)
+            )
+        return queryset
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.ordering)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['search'] = self.get_search()
+        return context
 
 
 class UserCreateView(SuccessMessageMixin, CreateView):
@@ -45,6 +125,15 @@ class UserUpdateView(
     def test_func(self):
         return self.request.user == self.get_object()
 
+    def form_valid(self, form):
+        # the password may change with the form, and with it the hash
+        session_hash = self.object.get_session_auth_hash()
+        response = super().form_valid(form)
+        forget_user(
+            self.object.pk, session_hash, self.object.get_session_auth_hash()
+        )
+        return response
+
     def handle_no_permission(self):
         if not self.request.user.is_authenticated:
             messages.error(
@@ -86,6 +175,13 @@ class UserDeleteView(
             )
         return redirect('users_index')
 
+    def form_valid(self, form):
+        user_id = self.object.pk
+        session_hash = self.object.get_session_auth_hash()
+        response = super().form_valid(form)
+        forget_user(user_id, session_hash)
+        return response
+
     def post(self, request, *args, **kwargs):
         user_to_delete = self.get_object()
         
@@ -0,0 +1,56 @@
+"""
+Version stamps for cached data.
+
+A version is the time (in nanoseconds) of the last change of a named piece of
+data, kept in the default cache so every worker sharing that cache sees the
+same stamp. Anything derived from the data can then be cached under its
+version and is dropped as soon as the stamp moves.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+KEY_PREFIX = 'version:'
+
+_local = {}
+
+
+def get_version(name):
+    key = KEY_PREFIX + name
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump(*names):
+    now = time.time_ns()
+    cache.set_many({KEY_PREFIX + name: now for name in names}, timeout=None)
+
+
+def invalidate(*names):
+    # Bump right away for reads inside the current transaction and once more
+    # after commit, so no other worker keeps data cached from before it.
+    bump(*names)
+    transaction.on_commit(lambda: bump(*names))
+
+
+def local_cache(name, build, timeout=None):
+    """
+    Return ``build()``, cached in this process until ``name`` changes or for
+    ``timeout`` seconds at most. A per-process default cache never sees
+    the stamps other workers bump, so the timeout bounds how long they
+    serve a stale value.
+    """
+    version = get_version(name)
+    cached = _local.get(name)
+    now = time.monotonic()
+    if cached is not None and cached[0] == version and now < cached[2]:
+        return cached[1]
+
+    value = build()
+    expires = now + timeout if timeout is not None else float('inf')
+    _local[name] = (version, value, expires)
+    return value
@@ -1,5 +1,98 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
 from django.views.generic import TemplateView
 
+from task_manager.metrics import render_prometheus
+from task_manager.tasks.choices import get_choices
+
+User = get_user_model()
+
 
 class IndexView(TemplateView):
     template_name = 'index.html'
+
+
+async def search_users(query, limit):
+    users = User.objects.order_by('first_name', 'last_name', 'pk')
+    if query:
+        users = users.filter(
+            Q(username__istartswith=query)
+            | Q(first_name__istartswith=query)
+            | Q(last_name__istartswith=query)
+        )
+    rows = users.values_list('pk', 'first_name', 'last_name')[:limit]
+    return [
+        (pk, f'{first_name} {last_name}')
+        async for pk, first_name, last_name in rows
+    ]
+
+
+def cached_search(name):
+    async def search(query, limit):
+        choices = await sync_to_async(get_choices)(name)
+        prefix = query.casefold()
+        matches = (
+            choice for choice in choices
+            if choice[1].casefold().startswith(prefix)
+        )
+        return [choice for _, choice in zip(range(limit), matches)]
+    return search
+
+
+class AutocompleteView(View):
+    default_limit = 20
+    max_limit = 50
+    searches = {
+        'users': search_users,
+        'labels': cached_search('labels'),
+        'statuses': cached_search('statuses'),
+    }
+
+    async def get(self, request, source):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse(
+                {'error': 'Вы не авторизованы! Пожалуйста, выполните вход.'},
+                status=403
+            )
+
+        search = self.searches.get(source)
+        if search is None:
+            raise Http404('Неизвестный источник')
+
+        query = request.GET.get('q', '').strip()
+        results = await search(query, self.get_limit())
+        return JsonResponse({
+            'results': [{'id': pk, 'text': text} for pk, text in results]
+        })
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+
+class MetricsView(View):
+    """Request metrics in the Prometheus text format."""
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if token:
+            allowed = constant_time_compare(
+                request.headers.get('Authorization', ''), f'Bearer {token}'
+            )
+        else:
+            allowed = settings.DEBUG or settings.METRICS_PUBLIC
+        if not allowed:
+            return HttpResponse(status=403)
+        return HttpResponse(
+            render_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
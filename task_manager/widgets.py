@@ -0,0 +1,65 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelectMixin:
+    """
+    Render only the empty and the currently selected options; the rest are
+    fetched from the autocomplete endpoint of ``source`` as the user types.
+    """
+
+    def __init__(self, source, attrs=None):
+        self.source = source
+        super().__init__(attrs)
+
+    class Media:
+        js = [forms.Script('js/autocomplete.js', defer=True)]
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse(
+            'autocomplete', args=[self.source]
+        )
+        return attrs
+
+    def selected_choices(self, value):
+        field = self.choices.field
+        if not self.allow_multiple_selected and field.empty_label is not None:
+            yield ('', field.empty_label)
+
+        pks = [pk for pk in value if pk not in ('', None)]
+        if not pks:
+            return
+        try:
+            objects = list(self.choices.queryset.filter(pk__in=pks))
+        except (ValueError, TypeError):
+            return
+        for obj in objects:
+            yield (obj.pk, field.label_from_instance(obj))
+
+    def optgroups(self, name, value, attrs=None):
+        groups = []
+        for index, (option_value, label) in enumerate(
+            self.selected_choices(value)
+        ):
+            option = self.create_option(
+                name,
+                option_value,
+                label,
+                str(option_value) in value,
+                index,
+                attrs=attrs,
+            )
+            groups.append((None, [option], index))
+        return groups
+
+
+class AutocompleteSelect(AutocompleteSelectMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(
+    AutocompleteSelectMixin,
+    forms.SelectMultiple
+):
+    pass
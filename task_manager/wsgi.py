@@ -7,6 +7,7 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
 
+import logging
 import os
 
 from django.core.wsgi import get_wsgi_application
@@ -14,3 +15,25 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_manager.settings')
 
 application = get_wsgi_application()
+
+
+def warm_up():
+    # Runs while gunicorn boots the worker, before it accepts connections.
+    from django.conf import settings
+
+    from task_manager.warmup import warm_templates
+
+    if not settings.TEMPLATE_WARMUP:
+        return
+    logger = logging.getLogger('task_manager')
+    try:
+        count, elapsed = warm_templates()
+    except Exception:
+        logger.exception('Template warm-up failed')
+    else:
+        logger.info(
+            'Compiled %d templates in %.1f ms', count, elapsed * 1000
+        )
+
+
+warm_up()